@@ -10,6 +10,7 @@ import sys
 import time
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -191,6 +192,12 @@ Use the WebFetch tool to retrieve article content. Focus on extracting meaningfu
     return assignment
 
 
+@lru_cache(maxsize=None)
+def get_client(api_url: str) -> AGFSClient:
+    """Return a shared AGFS client for api_url, so polling reuses its connections"""
+    return AGFSClient(api_url)
+
+
 def enqueue_task(
     queue_path: str, task_data: str, agfs_api_url: Optional[str] = None
 ) -> bool:
@@ -198,9 +205,7 @@ def enqueue_task(
     enqueue_path = f"{queue_path}/enqueue"
 
     try:
-        # Initialize AGFS client
-        api_url = agfs_api_url or "http://localhost:8080"
-        client = AGFSClient(api_url)
+        client = get_client(agfs_api_url or "http://localhost:8080")
 
         # Write task data to enqueue path
         client.write(enqueue_path, task_data.encode("utf-8"))
@@ -281,9 +286,7 @@ def wait_for_results(
 def list_files(path: str, agfs_api_url: Optional[str] = None) -> List[str]:
     """List files in a AGFS directory"""
     try:
-        # Initialize AGFS client
-        api_url = agfs_api_url or "http://localhost:8080"
-        client = AGFSClient(api_url)
+        client = get_client(agfs_api_url or "http://localhost:8080")
 
         # List directory and extract file names
         files = client.ls(path)
@@ -296,9 +299,7 @@ def list_files(path: str, agfs_api_url: Optional[str] = None) -> List[str]:
 def read_file(file_path: str, agfs_api_url: Optional[str] = None) -> Optional[str]:
     """Read a file from AGFS"""
     try:
-        # Initialize AGFS client
-        api_url = agfs_api_url or "http://localhost:8080"
-        client = AGFSClient(api_url)
+        client = get_client(agfs_api_url or "http://localhost:8080")
 
         # Read file content
         content = client.cat(file_path)
@@ -397,9 +398,7 @@ def save_report(
     print(f"💾 Saving report to: {report_path}")
 
     try:
-        # Initialize AGFS client
-        api_url = agfs_api_url or "http://localhost:8080"
-        client = AGFSClient(api_url)
+        client = get_client(agfs_api_url or "http://localhost:8080")
 
         # Write report content
         client.write(report_path, report.encode("utf-8"))
@@ -93,6 +93,7 @@ class ResultsCollector:
         self,
         results_path: str,
         agfs_api_baseurl: Optional[str] = "http://localhost:8080",
+        client: Optional[AGFSClient] = None,
     ):
         """
         Initialize results collector
@@ -100,10 +101,11 @@ class ResultsCollector:
         Args:
             results_path: S3FS path where results are stored
             agfs_api_baseurl: AGFS API server URL (optional)
+            client: Existing AGFS client to reuse (optional)
         """
         self.results_path = results_path
         self.agfs_api_baseurl = agfs_api_baseurl
-        self.client = AGFSClient(agfs_api_baseurl)
+        self.client = client or AGFSClient(agfs_api_baseurl)
 
     def list_results(self) -> List[str]:
         """
@@ -341,7 +343,8 @@ Make sure to include:
     if args.wait:
         collector = ResultsCollector(
             results_path=task_results_path,
-            agfs_api_baseurl=args.api_url
+            agfs_api_baseurl=args.api_url,
+            client=broadcaster.client
         )
 
         collected_results = collector.wait_for_results(
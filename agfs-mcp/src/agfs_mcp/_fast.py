@@ -0,0 +1,60 @@
+"""Result formatting helpers for the MCP tool handlers.
+
+This module is fully annotated and has no MCP imports so that it can be
+compiled with mypyc (see the opt-in hatch hook in pyproject.toml). It is
+used as plain Python when the hook is not enabled.
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import msgspec  # type: ignore
+    _msgspec_encode: Optional[Callable[[Any], bytes]] = msgspec.json.Encoder().encode
+except ImportError:
+    _msgspec_encode = None
+
+# Grep results with more matches than this are returned as NDJSON
+GREP_NDJSON_THRESHOLD = 200
+
+_encode_str: Callable[[str], str] = json.encoder.encode_basestring_ascii
+
+
+def fmt_status(result: Any) -> str:
+    """Format a small status response such as {"message": ...}.
+
+    Flat dicts of string values (the server's success/health responses) are
+    rendered directly; output is identical to json.dumps(result, indent=2).
+    Anything else falls back to the full encoder.
+    """
+    if type(result) is dict and result:
+        parts: List[str] = []
+        for key, value in result.items():
+            if type(key) is not str or type(value) is not str:
+                return json.dumps(result, indent=2)
+            parts.append(f"  {_encode_str(key)}: {_encode_str(value)}")
+        return "{\n" + ",\n".join(parts) + "\n}"
+    return json.dumps(result, indent=2)
+
+
+def dump_compact(obj: Any) -> str:
+    """Encode obj as compact single-line JSON, using msgspec when available"""
+    if _msgspec_encode is not None:
+        return _msgspec_encode(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def fmt_grep(result: Any) -> str:
+    """Format a grep response.
+
+    Small results keep the pretty-printed JSON. Large ones are emitted as
+    NDJSON (one match per line, then a summary line, matching the server's
+    streaming format), which skips the indentation cost.
+    """
+    matches = result.get('matches') if isinstance(result, dict) else None
+    if not matches or len(matches) <= GREP_NDJSON_THRESHOLD:
+        return json.dumps(result, indent=2, ensure_ascii=False)
+    lines: List[str] = [dump_compact(match) for match in matches]
+    summary: Dict[str, Any] = {"type": "summary", "count": result.get('count', len(matches))}
+    lines.append(dump_compact(summary))
+    return "\n".join(lines)
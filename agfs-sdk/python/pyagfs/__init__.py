@@ -2,9 +2,26 @@
 
 __version__ = "0.1.2"
 
-from .client import AGFSClient
 from .exceptions import AGFSClientError, AGFSConnectionError, AGFSTimeoutError, AGFSHTTPError
-from .helpers import cp, upload, download
+
+# The client and helpers pull in requests; load them on first access so that
+# importing just the exceptions stays cheap
+_LAZY_ATTRS = {
+    "AGFSClient": ".client",
+    "cp": ".helpers",
+    "upload": ".helpers",
+    "download": ".helpers",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "AGFSClient",
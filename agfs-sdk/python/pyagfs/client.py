@@ -2,10 +2,29 @@
 
 import requests
 import time
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional, Union, Iterator, BinaryIO
 from requests.exceptions import ConnectionError, Timeout, RequestException
 
-from .exceptions import AGFSClientError
+from .exceptions import AGFSClientError, AGFSHTTPError
+
+# Keep-alive connections held per host; sized for the parallel transfers in
+# helpers.py so concurrent requests reuse connections instead of reconnecting
+POOL_MAXSIZE = 16
+
+
+def _endpoint_missing(response) -> bool:
+    """Whether an error response says the server has no such endpoint (404 or
+    405 from the router), rather than the endpoint itself failing, whose
+    errors always carry a JSON body"""
+    if response.status_code == 405:
+        return True
+    if response.status_code != 404:
+        return False
+    try:
+        return "error" not in response.json()
+    except (ValueError, TypeError):
+        return True
 
 
 class AGFSClient:
@@ -27,6 +46,9 @@ class AGFSClient:
             api_base_url = api_base_url + "/api/v1"
         self.api_base = api_base_url
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         self.timeout = timeout
 
     def _handle_request_error(self, e: Exception, operation: str = "request") -> None:
@@ -146,6 +168,60 @@ class AGFSClient:
         except Exception as e:
             self._handle_request_error(e)
 
+    def cat_into(self, path: str, fileobj: BinaryIO, chunk_size: int = 64 * 1024) -> int:
+        """Copy file content into a writable binary file object
+
+        The body is read as it arrives into one reusable buffer, rather than
+        allocating a new bytes object per chunk or holding the whole file.
+        An uncompressed body is asked for; if the server compresses it
+        anyway, it is decoded as it is read.
+
+        Args:
+            path: File path
+            fileobj: Destination opened for binary writing
+            chunk_size: Size of the reusable read buffer (default: 64 KiB)
+
+        Returns:
+            Number of bytes copied
+        """
+        try:
+            response = self.session.get(
+                f"{self.api_base}/files",
+                params={"path": path},
+                headers={"Accept-Encoding": "identity"},
+                stream=True,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+        except Exception as e:
+            self._handle_request_error(e)
+
+        total = 0
+        if response.headers.get("Content-Encoding", "identity").lower() != "identity":
+            # raw.readinto would copy the still-compressed bytes; let
+            # urllib3 decode them instead
+            with response:
+                read = response.raw.read
+                while True:
+                    chunk = read(chunk_size, decode_content=True)
+                    if not chunk:
+                        break
+                    fileobj.write(chunk)
+                    total += len(chunk)
+            return total
+
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
+        with response:
+            readinto = response.raw.readinto
+            while True:
+                n = readinto(buf)
+                if not n:
+                    break
+                fileobj.write(view[:n])
+                total += n
+        return total
+
     def write(self, path: str, data: Union[bytes, Iterator[bytes], BinaryIO], max_retries: int = 3) -> str:
         """Write data to file and return the response message
 
@@ -166,9 +242,21 @@ class AGFSClient:
             # For streaming/unknown size, use no timeout
             write_timeout = None
 
+        # A retry has to resend the whole body: a seekable file is rewound to
+        # where it started before each attempt, and any other stream, which
+        # can't be replayed, gets a single attempt
+        start = None
+        if not isinstance(data, bytes):
+            if hasattr(data, "seekable") and data.seekable():
+                start = data.tell()
+            else:
+                max_retries = 0
+
         last_error = None
 
         for attempt in range(max_retries + 1):
+            if start is not None:
+                data.seek(start)
             try:
                 response = self.session.put(
                     f"{self.api_base}/files",
@@ -434,7 +522,8 @@ class AGFSClient:
         except Exception as e:
             self._handle_request_error(e)
 
-    def grep(self, path: str, pattern: str, recursive: bool = False, case_insensitive: bool = False, stream: bool = False):
+    def grep(self, path: str, pattern: str, recursive: bool = False, case_insensitive: bool = False,
+             stream: bool = False, count_only: bool = False):
         """Search for a pattern in files using regular expressions
 
         Args:
@@ -443,6 +532,8 @@ class AGFSClient:
             recursive: Whether to search recursively in directories (default: False)
             case_insensitive: Whether to perform case-insensitive matching (default: False)
             stream: Whether to stream results as NDJSON (default: False)
+            count_only: Only count matches; the server sends no match objects,
+                just the count (default: False)
 
         Returns:
             If stream=False: Dict with 'matches' (list of match objects) and 'count'
@@ -468,7 +559,8 @@ class AGFSClient:
                     "pattern": pattern,
                     "recursive": recursive,
                     "case_insensitive": case_insensitive,
-                    "stream": stream
+                    "stream": stream,
+                    "count_only": count_only
                 },
                 timeout=None if stream else self.timeout,
                 stream=stream
@@ -524,3 +616,62 @@ class AGFSClient:
             return response.json()
         except Exception as e:
             self._handle_request_error(e)
+
+    def bulk_upload(self, path: str, data: Union[bytes, Iterator[bytes], BinaryIO]) -> str:
+        """Upload a tar archive, unpacking its files and directories under a directory
+
+        Args:
+            path: Existing directory to unpack into
+            data: Tar archive as bytes, iterator of bytes, or file-like object
+
+        Returns:
+            Response message from server
+
+        Raises:
+            AGFSHTTPError: If the server predates the bulk endpoint
+            AGFSClientError: For any other failure
+        """
+        try:
+            response = self.session.post(
+                f"{self.api_base}/bulk",
+                params={"path": path},
+                data=data,
+                timeout=None  # Size of the archive is unknown
+            )
+            response.raise_for_status()
+            return response.json().get("message", "OK")
+        except requests.exceptions.HTTPError as e:
+            if _endpoint_missing(e.response):
+                raise AGFSHTTPError("Server has no bulk upload endpoint", e.response.status_code)
+            self._handle_request_error(e)
+        except Exception as e:
+            self._handle_request_error(e)
+
+    def bulk_download(self, path: str):
+        """Download a directory tree as a tar stream
+
+        Args:
+            path: Directory to download
+
+        Returns:
+            Response object whose body is the tar archive
+
+        Raises:
+            AGFSHTTPError: If the server predates the bulk endpoint
+            AGFSClientError: For any other failure
+        """
+        try:
+            response = self.session.get(
+                f"{self.api_base}/bulk",
+                params={"path": path},
+                stream=True,
+                timeout=None  # Size of the tree is unknown
+            )
+            response.raise_for_status()
+            return response
+        except requests.exceptions.HTTPError as e:
+            if _endpoint_missing(e.response):
+                raise AGFSHTTPError("Server has no bulk download endpoint", e.response.status_code)
+            self._handle_request_error(e)
+        except Exception as e:
+            self._handle_request_error(e)
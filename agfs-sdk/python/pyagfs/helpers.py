@@ -7,14 +7,19 @@ This module provides high-level helper functions for common operations:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, List, Tuple
 
 if TYPE_CHECKING:
     from .client import AGFSClient
 
+# Default number of parallel per-file transfers for recursive operations
+DEFAULT_CONCURRENCY = 16
 
-def cp(client: "AGFSClient", src: str, dst: str, recursive: bool = False, stream: bool = False) -> None:
+
+def cp(client: "AGFSClient", src: str, dst: str, recursive: bool = False, stream: bool = False,
+       concurrency: int = DEFAULT_CONCURRENCY) -> None:
     """Copy a file or directory within AGFS.
 
     Args:
@@ -23,6 +28,7 @@ def cp(client: "AGFSClient", src: str, dst: str, recursive: bool = False, stream
         dst: Destination path in AGFS
         recursive: If True, copy directories recursively
         stream: If True, use streaming for large files (memory efficient)
+        concurrency: Number of files transferred in parallel when copying a directory
 
     Raises:
         AGFSClientError: If source doesn't exist or operation fails
@@ -39,12 +45,13 @@ def cp(client: "AGFSClient", src: str, dst: str, recursive: bool = False, stream
     if is_dir:
         if not recursive:
             raise ValueError(f"Cannot copy directory '{src}' without recursive=True")
-        _copy_directory(client, src, dst, stream)
+        _copy_directory(client, src, dst, stream, concurrency)
     else:
         _copy_file(client, src, dst, stream)
 
 
-def upload(client: "AGFSClient", local_path: str, remote_path: str, recursive: bool = False, stream: bool = False) -> None:
+def upload(client: "AGFSClient", local_path: str, remote_path: str, recursive: bool = False, stream: bool = False,
+           concurrency: int = DEFAULT_CONCURRENCY) -> None:
     """Upload a file or directory from local filesystem to AGFS.
 
     Args:
@@ -53,6 +60,7 @@ def upload(client: "AGFSClient", local_path: str, remote_path: str, recursive: b
         remote_path: Destination path in AGFS
         recursive: If True, upload directories recursively
         stream: If True, use streaming for large files (memory efficient)
+        concurrency: Number of files uploaded in parallel when uploading a directory
 
     Raises:
         FileNotFoundError: If local path doesn't exist
@@ -71,12 +79,13 @@ def upload(client: "AGFSClient", local_path: str, remote_path: str, recursive: b
     if local.is_dir():
         if not recursive:
             raise ValueError(f"Cannot upload directory '{local_path}' without recursive=True")
-        _upload_directory(client, local, remote_path, stream)
+        _upload_directory(client, local, remote_path, stream, concurrency)
     else:
         _upload_file(client, local, remote_path, stream)
 
 
-def download(client: "AGFSClient", remote_path: str, local_path: str, recursive: bool = False, stream: bool = False) -> None:
+def download(client: "AGFSClient", remote_path: str, local_path: str, recursive: bool = False, stream: bool = False,
+             concurrency: int = DEFAULT_CONCURRENCY) -> None:
     """Download a file or directory from AGFS to local filesystem.
 
     Args:
@@ -85,6 +94,7 @@ def download(client: "AGFSClient", remote_path: str, local_path: str, recursive:
         local_path: Destination path on local filesystem
         recursive: If True, download directories recursively
         stream: If True, use streaming for large files (memory efficient)
+        concurrency: Number of files downloaded in parallel when downloading a directory
 
     Raises:
         AGFSClientError: If remote path doesn't exist or download fails
@@ -101,7 +111,7 @@ def download(client: "AGFSClient", remote_path: str, local_path: str, recursive:
     if is_dir:
         if not recursive:
             raise ValueError(f"Cannot download directory '{remote_path}' without recursive=True")
-        _download_directory(client, remote_path, Path(local_path), stream)
+        _download_directory(client, remote_path, Path(local_path), stream, concurrency)
     else:
         _download_file(client, remote_path, Path(local_path), stream)
 
@@ -129,8 +139,15 @@ def _copy_file(client: "AGFSClient", src: str, dst: str, stream: bool) -> None:
         client.write(dst, data)
 
 
-def _copy_directory(client: "AGFSClient", src: str, dst: str, stream: bool) -> None:
+def _copy_directory(client: "AGFSClient", src: str, dst: str, stream: bool, concurrency: int) -> None:
     """Recursively copy a directory within AGFS."""
+    files = []
+    _collect_copy_tree(client, src, dst, files)
+    _run_transfers(lambda s, d: _copy_file(client, s, d, stream), files, concurrency)
+
+
+def _collect_copy_tree(client: "AGFSClient", src: str, dst: str, files: List[Tuple[str, str]]) -> None:
+    """Create destination directories and collect (src, dst) file pairs."""
     # Create destination directory
     try:
         client.mkdir(dst)
@@ -147,11 +164,10 @@ def _copy_directory(client: "AGFSClient", src: str, dst: str, stream: bool) -> N
         dst_path = f"{dst.rstrip('/')}/{item_name}"
 
         if item.get('isDir', False):
-            # Recursively copy subdirectory
-            _copy_directory(client, src_path, dst_path, stream)
+            # Recursively walk subdirectory
+            _collect_copy_tree(client, src_path, dst_path, files)
         else:
-            # Copy file
-            _copy_file(client, src_path, dst_path, stream)
+            files.append((src_path, dst_path))
 
 
 def _upload_file(client: "AGFSClient", local_file: Path, remote_path: str, stream: bool) -> None:
@@ -178,8 +194,15 @@ def _upload_file(client: "AGFSClient", local_file: Path, remote_path: str, strea
         client.write(remote_path, data)
 
 
-def _upload_directory(client: "AGFSClient", local_dir: Path, remote_path: str, stream: bool) -> None:
+def _upload_directory(client: "AGFSClient", local_dir: Path, remote_path: str, stream: bool, concurrency: int) -> None:
     """Recursively upload a directory to AGFS."""
+    files = []
+    _collect_upload_tree(client, local_dir, remote_path, files)
+    _run_transfers(lambda l, r: _upload_file(client, l, r, stream), files, concurrency)
+
+
+def _collect_upload_tree(client: "AGFSClient", local_dir: Path, remote_path: str, files: List[Tuple[Path, str]]) -> None:
+    """Create remote directories and collect (local, remote) file pairs."""
     # Create remote directory
     try:
         client.mkdir(remote_path)
@@ -192,11 +215,10 @@ def _upload_directory(client: "AGFSClient", local_dir: Path, remote_path: str, s
         remote_item_path = f"{remote_path.rstrip('/')}/{item.name}"
 
         if item.is_dir():
-            # Recursively upload subdirectory
-            _upload_directory(client, item, remote_item_path, stream)
+            # Recursively walk subdirectory
+            _collect_upload_tree(client, item, remote_item_path, files)
         else:
-            # Upload file
-            _upload_file(client, item, remote_item_path, stream)
+            files.append((item, remote_item_path))
 
 
 def _download_file(client: "AGFSClient", remote_path: str, local_file: Path, stream: bool) -> None:
@@ -211,14 +233,20 @@ def _download_file(client: "AGFSClient", remote_path: str, local_file: Path, str
             for chunk in response.iter_content(chunk_size=8192):
                 f.write(chunk)
     else:
-        # Read entire file
-        data = client.cat(remote_path)
+        # Copy through a reusable buffer instead of holding the whole file
         with open(local_file, 'wb') as f:
-            f.write(data)
+            client.cat_into(remote_path, f)
 
 
-def _download_directory(client: "AGFSClient", remote_path: str, local_dir: Path, stream: bool) -> None:
+def _download_directory(client: "AGFSClient", remote_path: str, local_dir: Path, stream: bool, concurrency: int) -> None:
     """Recursively download a directory from AGFS."""
+    files = []
+    _collect_download_tree(client, remote_path, local_dir, files)
+    _run_transfers(lambda r, l: _download_file(client, r, l, stream), files, concurrency)
+
+
+def _collect_download_tree(client: "AGFSClient", remote_path: str, local_dir: Path, files: List[Tuple[str, Path]]) -> None:
+    """Create local directories and collect (remote, local) file pairs."""
     # Create local directory
     local_dir.mkdir(parents=True, exist_ok=True)
 
@@ -231,11 +259,27 @@ def _download_directory(client: "AGFSClient", remote_path: str, local_dir: Path,
         local_item_path = local_dir / item_name
 
         if item.get('isDir', False):
-            # Recursively download subdirectory
-            _download_directory(client, remote_item_path, local_item_path, stream)
+            # Recursively walk subdirectory
+            _collect_download_tree(client, remote_item_path, local_item_path, files)
         else:
-            # Download file
-            _download_file(client, remote_item_path, local_item_path, stream)
+            files.append((remote_item_path, local_item_path))
+
+
+def _run_transfers(transfer: Callable, pairs: list, concurrency: int) -> None:
+    """Run transfer(src, dst) for every pair, up to concurrency at a time.
+
+    Directories are created during the tree walk, so per-file transfers are
+    independent and can overlap their HTTP round-trips. The first failure is
+    re-raised once the pool has shut down.
+    """
+    if concurrency <= 1 or len(pairs) <= 1:
+        for src, dst in pairs:
+            transfer(src, dst)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(pairs))) as executor:
+        for _ in executor.map(lambda pair: transfer(*pair), pairs):
+            pass
 
 
 def _ensure_remote_parent_dir(client: "AGFSClient", path: str) -> None:
@@ -0,0 +1,96 @@
+import gzip
+import io
+import threading
+import unittest
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+from requests.exceptions import ConnectionError
+
+from pyagfs import AGFSClient, AGFSClientError
+
+CONTENT = b"hello world\n" * 10000
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    # Set per test: whether GET /files answers with a gzip-encoded body
+    compress = False
+
+    def do_GET(self):
+        body = CONTENT
+        self.send_response(200)
+        if self.compress:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCatInto(unittest.TestCase):
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), FileHandler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = AGFSClient(f"http://127.0.0.1:{self.server.server_port}/api/v1")
+
+    def test_cat_into(self):
+        FileHandler.compress = False
+        out = io.BytesIO()
+        self.assertEqual(self.client.cat_into("/file", out, chunk_size=4096), len(CONTENT))
+        self.assertEqual(out.getvalue(), CONTENT)
+
+    def test_cat_into_decodes_compressed_response(self):
+        FileHandler.compress = True
+        out = io.BytesIO()
+        self.assertEqual(self.client.cat_into("/file", out, chunk_size=4096), len(CONTENT))
+        self.assertEqual(out.getvalue(), CONTENT)
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"message": "ok"}
+
+
+class TestWriteRetry(unittest.TestCase):
+    def setUp(self):
+        self.client = AGFSClient("http://127.0.0.1:1/api/v1")
+        self.sent = []
+
+        def put(url, params=None, data=None, timeout=None):
+            # The first attempt drops the connection part way through the body
+            if not self.sent:
+                self.sent.append(data.read(3) if hasattr(data, "read") else next(data))
+                raise ConnectionError("connection reset")
+            self.sent.append(data.read() if hasattr(data, "read") else b"".join(data))
+            return FakeResponse()
+
+        patcher = mock.patch.object(self.client.session, "put", side_effect=put)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("time.sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retry_resends_whole_file(self):
+        with redirect_stdout(io.StringIO()):
+            self.client.write("/file", io.BytesIO(b"hello world"))
+        self.assertEqual(self.sent, [b"hel", b"hello world"])
+
+    def test_iterator_is_not_retried(self):
+        with redirect_stdout(io.StringIO()), self.assertRaises(AGFSClientError):
+            self.client.write("/file", iter([b"hello", b" world"]))
+        self.assertEqual(self.sent, [b"hello"])
+
+
+if __name__ == "__main__":
+    unittest.main()
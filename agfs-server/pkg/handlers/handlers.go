@@ -1,6 +1,7 @@
 package handlers
 
 import (
+	"archive/tar"
 	"bufio"
 	"bytes"
 	"crypto/md5"
@@ -573,6 +574,150 @@ func (h *Handler) Touch(w http.ResponseWriter, r *http.Request) {
 	writeJSON(w, http.StatusOK, SuccessResponse{Message: "touched"})
 }
 
+// BulkUpload handles POST /bulk?path=<dir>
+// The request body is a tar stream whose directories and regular files are
+// created under path, so a whole tree is uploaded in a single request.
+// Entry names are always taken relative to path: ".." components cannot
+// climb above it and absolute names are rooted at it.
+func (h *Handler) BulkUpload(w http.ResponseWriter, r *http.Request) {
+	root := r.URL.Query().Get("path")
+	if root == "" {
+		writeError(w, http.StatusBadRequest, "path parameter is required")
+		return
+	}
+
+	tr := tar.NewReader(r.Body)
+	files := 0
+	for {
+		hdr, err := tr.Next()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			writeError(w, http.StatusBadRequest, "invalid tar stream: "+err.Error())
+			return
+		}
+
+		// Cleaning against "/" keeps entries from escaping root via ".."
+		name := filepath.ToSlash(filepath.Clean("/" + filepath.ToSlash(hdr.Name)))
+		if name == "/" {
+			continue
+		}
+		target := filepath.ToSlash(filepath.Join(root, name))
+
+		switch hdr.Typeflag {
+		case tar.TypeDir:
+			if err := h.fs.Mkdir(target, 0755); err != nil {
+				// An existing directory is fine, anything else is not
+				if info, statErr := h.fs.Stat(target); statErr != nil || !info.IsDir {
+					writeError(w, mapErrorToStatus(err), err.Error())
+					return
+				}
+			}
+		case tar.TypeReg:
+			if err := h.copyToFile(target, tr); err != nil {
+				if errors.Is(err, io.ErrUnexpectedEOF) {
+					writeError(w, http.StatusBadRequest, "invalid tar stream: "+err.Error())
+				} else {
+					writeError(w, mapErrorToStatus(err), err.Error())
+				}
+				return
+			}
+			files++
+		}
+	}
+
+	writeJSON(w, http.StatusOK, SuccessResponse{Message: fmt.Sprintf("uploaded %d files", files)})
+}
+
+// copyToFile streams r into path through the filesystem's writer, so an
+// entry is never held in memory by the handler itself
+func (h *Handler) copyToFile(path string, r io.Reader) error {
+	wc, err := h.fs.OpenWrite(path)
+	if err != nil {
+		return err
+	}
+	if _, err := io.Copy(wc, r); err != nil {
+		wc.Close()
+		return err
+	}
+	return wc.Close()
+}
+
+// BulkDownload handles GET /bulk?path=<dir>
+// Responds with a tar stream of the directory tree under path
+func (h *Handler) BulkDownload(w http.ResponseWriter, r *http.Request) {
+	root := r.URL.Query().Get("path")
+	if root == "" {
+		writeError(w, http.StatusBadRequest, "path parameter is required")
+		return
+	}
+
+	info, err := h.fs.Stat(root)
+	if err != nil {
+		writeError(w, mapErrorToStatus(err), err.Error())
+		return
+	}
+	if !info.IsDir {
+		writeError(w, http.StatusBadRequest, "path is not a directory")
+		return
+	}
+
+	w.Header().Set("Content-Type", "application/x-tar")
+	w.WriteHeader(http.StatusOK)
+
+	tw := tar.NewWriter(w)
+	if err := h.tarDirectory(tw, root, ""); err != nil {
+		// The status line is already sent; abort the connection so the
+		// client sees a truncated stream rather than a short archive
+		log.Errorf("bulk download of %s failed: %v", root, err)
+		panic(http.ErrAbortHandler)
+	}
+	if err := tw.Close(); err != nil {
+		log.Errorf("bulk download of %s failed: %v", root, err)
+	}
+}
+
+// tarDirectory writes the entries of dir to tw, named relative to the download root
+func (h *Handler) tarDirectory(tw *tar.Writer, dir, prefix string) error {
+	entries, err := h.fs.ReadDir(dir)
+	if err != nil {
+		return err
+	}
+
+	for _, entry := range entries {
+		name := entry.Name
+		if prefix != "" {
+			name = prefix + "/" + entry.Name
+		}
+		full := filepath.ToSlash(filepath.Join(dir, entry.Name))
+
+		if entry.IsDir {
+			hdr := &tar.Header{Typeflag: tar.TypeDir, Name: name + "/", Mode: 0755, ModTime: entry.ModTime}
+			if err := tw.WriteHeader(hdr); err != nil {
+				return err
+			}
+			if err := h.tarDirectory(tw, full, name); err != nil {
+				return err
+			}
+			continue
+		}
+
+		data, err := h.fs.Read(full, 0, -1)
+		if err != nil && err != io.EOF {
+			return err
+		}
+		hdr := &tar.Header{Typeflag: tar.TypeReg, Name: name, Mode: 0644, Size: int64(len(data)), ModTime: entry.ModTime}
+		if err := tw.WriteHeader(hdr); err != nil {
+			return err
+		}
+		if _, err := tw.Write(data); err != nil {
+			return err
+		}
+	}
+	return nil
+}
+
 // SetupRoutes sets up all HTTP routes with /api/v1 prefix
 func (h *Handler) SetupRoutes(mux *http.ServeMux) {
 	mux.HandleFunc("/api/v1/health", h.Health)
@@ -644,6 +789,16 @@ func (h *Handler) SetupRoutes(mux *http.ServeMux) {
 		}
 		h.Touch(w, r)
 	})
+	mux.HandleFunc("/api/v1/bulk", func(w http.ResponseWriter, r *http.Request) {
+		switch r.Method {
+		case http.MethodPost:
+			h.BulkUpload(w, r)
+		case http.MethodGet:
+			h.BulkDownload(w, r)
+		default:
+			writeError(w, http.StatusMethodNotAllowed, "method not allowed")
+		}
+	})
 }
 
 // streamFile handles streaming file reads with HTTP chunked transfer encoding
@@ -753,6 +908,7 @@ type GrepRequest struct {
 	Recursive       bool   `json:"recursive"`         // Whether to search recursively in directories
 	CaseInsensitive bool   `json:"case_insensitive"`  // Case-insensitive matching
 	Stream          bool   `json:"stream"`            // Stream results as NDJSON (one match per line)
+	CountOnly       bool   `json:"count_only"`        // Only count matching lines; no match objects are built or sent
 }
 
 // GrepMatch represents a single match result
@@ -809,7 +965,23 @@ func (h *Handler) Grep(w http.ResponseWriter, r *http.Request) {
 
 	// Handle stream mode
 	if req.Stream {
-		h.grepStream(w, req.Path, re, info.IsDir, req.Recursive)
+		h.grepStream(w, req.Path, re, info.IsDir, req.Recursive, req.CountOnly)
+		return
+	}
+
+	if info.IsDir && !req.Recursive {
+		writeError(w, http.StatusBadRequest, "path is a directory, use recursive=true to search")
+		return
+	}
+
+	// Count-only mode: tally matching lines without building any matches
+	if req.CountOnly {
+		count, err := h.grepCount(req.Path, re, info.IsDir)
+		if err != nil {
+			writeError(w, http.StatusInternalServerError, "grep failed: "+err.Error())
+			return
+		}
+		writeJSON(w, http.StatusOK, GrepResponse{Matches: []GrepMatch{}, Count: count})
 		return
 	}
 
@@ -818,12 +990,7 @@ func (h *Handler) Grep(w http.ResponseWriter, r *http.Request) {
 
 	// Search in file or directory
 	if info.IsDir {
-		if req.Recursive {
-			matches, err = h.grepDirectory(req.Path, re)
-		} else {
-			writeError(w, http.StatusBadRequest, "path is a directory, use recursive=true to search")
-			return
-		}
+		matches, err = h.grepDirectory(req.Path, re)
 	} else {
 		matches, err = h.grepFile(req.Path, re)
 	}
@@ -842,7 +1009,8 @@ func (h *Handler) Grep(w http.ResponseWriter, r *http.Request) {
 }
 
 // grepStream handles streaming grep results as NDJSON
-func (h *Handler) grepStream(w http.ResponseWriter, path string, re *regexp.Regexp, isDir bool, recursive bool) {
+// With countOnly, matches are only counted and just the final summary is sent
+func (h *Handler) grepStream(w http.ResponseWriter, path string, re *regexp.Regexp, isDir bool, recursive bool, countOnly bool) {
 	// Set headers for NDJSON streaming
 	w.Header().Set("Content-Type", "application/x-ndjson")
 	w.Header().Set("Transfer-Encoding", "chunked")
@@ -870,16 +1038,18 @@ func (h *Handler) grepStream(w http.ResponseWriter, path string, re *regexp.Rege
 
 	// Search and stream results
 	var err error
-	if isDir {
-		if !recursive {
-			// Send error as JSON
-			errMatch := map[string]interface{}{
-				"error": "path is a directory, use recursive=true to search",
-			}
-			encoder.Encode(errMatch)
-			flusher.Flush()
-			return
+	if isDir && !recursive {
+		// Send error as JSON
+		errMatch := map[string]interface{}{
+			"error": "path is a directory, use recursive=true to search",
 		}
+		encoder.Encode(errMatch)
+		flusher.Flush()
+		return
+	}
+	if countOnly {
+		matchCount, err = h.grepCount(path, re, isDir)
+	} else if isDir {
 		err = h.grepDirectoryStream(path, re, sendMatch)
 	} else {
 		err = h.grepFileStream(path, re, sendMatch)
@@ -897,6 +1067,44 @@ func (h *Handler) grepStream(w http.ResponseWriter, path string, re *regexp.Rege
 	flusher.Flush()
 }
 
+// grepCount counts the lines matching re in a file, or in every file under a
+// directory, matching each line's bytes in place: no match and no string is
+// built per line
+func (h *Handler) grepCount(path string, re *regexp.Regexp, isDir bool) (int, error) {
+	if !isDir {
+		data, err := h.fs.Read(path, 0, -1)
+		// io.EOF is normal when reading entire file, only return error for other errors
+		if err != nil && err != io.EOF {
+			return 0, err
+		}
+		count := 0
+		scanner := bufio.NewScanner(bytes.NewReader(data))
+		for scanner.Scan() {
+			if re.Match(scanner.Bytes()) {
+				count++
+			}
+		}
+		return count, scanner.Err()
+	}
+
+	entries, err := h.fs.ReadDir(path)
+	if err != nil {
+		return 0, err
+	}
+	count := 0
+	for _, entry := range entries {
+		fullPath := filepath.ToSlash(filepath.Join(path, entry.Name))
+		n, err := h.grepCount(fullPath, re, entry.IsDir)
+		if err != nil {
+			// Log error but continue searching other files
+			log.Warnf("failed to search %s: %v", fullPath, err)
+			continue
+		}
+		count += n
+	}
+	return count, nil
+}
+
 // grepFileStream searches for pattern in a single file and calls callback for each match
 func (h *Handler) grepFileStream(path string, re *regexp.Regexp, callback func(GrepMatch) error) error {
 	// Read file content
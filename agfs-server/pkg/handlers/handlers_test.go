@@ -0,0 +1,219 @@
+package handlers
+
+import (
+	"archive/tar"
+	"bytes"
+	"encoding/json"
+	"io"
+	"net/http"
+	"net/http/httptest"
+	"strings"
+	"testing"
+
+	"github.com/c4pt0r/agfs/agfs-server/pkg/plugins/memfs"
+)
+
+type tarEntry struct {
+	name string
+	dir  bool
+	data string
+}
+
+func buildTar(t *testing.T, entries []tarEntry) []byte {
+	t.Helper()
+	var buf bytes.Buffer
+	tw := tar.NewWriter(&buf)
+	for _, e := range entries {
+		hdr := &tar.Header{Name: e.name, Mode: 0644, Typeflag: tar.TypeReg, Size: int64(len(e.data))}
+		if e.dir {
+			hdr = &tar.Header{Name: e.name, Mode: 0755, Typeflag: tar.TypeDir}
+		}
+		if err := tw.WriteHeader(hdr); err != nil {
+			t.Fatalf("WriteHeader: %v", err)
+		}
+		if _, err := tw.Write([]byte(e.data)); err != nil {
+			t.Fatalf("Write: %v", err)
+		}
+	}
+	if err := tw.Close(); err != nil {
+		t.Fatalf("Close: %v", err)
+	}
+	return buf.Bytes()
+}
+
+func newBulkTestServer(t *testing.T) (*memfs.MemoryFS, *httptest.Server) {
+	t.Helper()
+	fs := memfs.NewMemoryFS()
+	if err := fs.Mkdir("/dst", 0755); err != nil {
+		t.Fatalf("Mkdir: %v", err)
+	}
+	mux := http.NewServeMux()
+	NewHandler(fs).SetupRoutes(mux)
+	server := httptest.NewServer(mux)
+	t.Cleanup(server.Close)
+	return fs, server
+}
+
+func postBulk(t *testing.T, server *httptest.Server, body []byte) int {
+	t.Helper()
+	resp, err := http.Post(server.URL+"/api/v1/bulk?path=/dst", "application/x-tar", bytes.NewReader(body))
+	if err != nil {
+		t.Fatalf("POST: %v", err)
+	}
+	resp.Body.Close()
+	return resp.StatusCode
+}
+
+func TestBulkUpload(t *testing.T) {
+	fs, server := newBulkTestServer(t)
+
+	body := buildTar(t, []tarEntry{
+		{name: "sub/", dir: true},
+		{name: "sub/a.txt", data: "hello"},
+		{name: "b.txt", data: "world"},
+	})
+	if status := postBulk(t, server, body); status != http.StatusOK {
+		t.Fatalf("expected 200, got %d", status)
+	}
+
+	for path, want := range map[string]string{"/dst/sub/a.txt": "hello", "/dst/b.txt": "world"} {
+		data, err := fs.Read(path, 0, -1)
+		if err != nil && err != io.EOF {
+			t.Fatalf("Read %s: %v", path, err)
+		}
+		if string(data) != want {
+			t.Errorf("%s: expected %q, got %q", path, want, data)
+		}
+	}
+}
+
+func TestBulkUpload_NamesStayUnderRoot(t *testing.T) {
+	fs, server := newBulkTestServer(t)
+
+	body := buildTar(t, []tarEntry{
+		{name: "../escape.txt", data: "up"},
+		{name: "sub/../../../deep.txt", data: "deep"},
+		{name: "/abs.txt", data: "abs"},
+	})
+	if status := postBulk(t, server, body); status != http.StatusOK {
+		t.Fatalf("expected 200, got %d", status)
+	}
+
+	for _, path := range []string{"/dst/escape.txt", "/dst/deep.txt", "/dst/abs.txt"} {
+		if _, err := fs.Stat(path); err != nil {
+			t.Errorf("expected %s to exist: %v", path, err)
+		}
+	}
+	for _, path := range []string{"/escape.txt", "/deep.txt", "/abs.txt"} {
+		if _, err := fs.Stat(path); err == nil {
+			t.Errorf("%s was written outside the upload root", path)
+		}
+	}
+}
+
+func TestBulkUpload_InvalidTar(t *testing.T) {
+	_, server := newBulkTestServer(t)
+
+	if status := postBulk(t, server, []byte("not a tar stream")); status != http.StatusBadRequest {
+		t.Errorf("garbage body: expected 400, got %d", status)
+	}
+
+	// A header promising more data than the stream holds
+	body := buildTar(t, []tarEntry{{name: "a.txt", data: "0123456789"}})
+	if status := postBulk(t, server, body[:512+4]); status != http.StatusBadRequest {
+		t.Errorf("truncated body: expected 400, got %d", status)
+	}
+}
+
+func TestBulkDownload(t *testing.T) {
+	fs, server := newBulkTestServer(t)
+	if err := fs.Mkdir("/dst/sub", 0755); err != nil {
+		t.Fatalf("Mkdir: %v", err)
+	}
+	if _, err := fs.Write("/dst/sub/a.txt", []byte("hello")); err != nil {
+		t.Fatalf("Write: %v", err)
+	}
+
+	resp, err := http.Get(server.URL + "/api/v1/bulk?path=/dst")
+	if err != nil {
+		t.Fatalf("GET: %v", err)
+	}
+	defer resp.Body.Close()
+	if resp.StatusCode != http.StatusOK {
+		t.Fatalf("expected 200, got %d", resp.StatusCode)
+	}
+
+	tr := tar.NewReader(resp.Body)
+	got := map[string]string{}
+	for {
+		hdr, err := tr.Next()
+		if err == io.EOF {
+			break
+		}
+		if err != nil {
+			t.Fatalf("Next: %v", err)
+		}
+		data, err := io.ReadAll(tr)
+		if err != nil {
+			t.Fatalf("ReadAll: %v", err)
+		}
+		got[hdr.Name] = string(data)
+	}
+	if len(got) != 2 || got["sub/a.txt"] != "hello" {
+		t.Errorf("unexpected archive contents: %v", got)
+	}
+	if _, ok := got["sub/"]; !ok {
+		t.Errorf("missing directory entry: %v", got)
+	}
+}
+
+func TestGrepCountOnly(t *testing.T) {
+	fs, server := newBulkTestServer(t)
+	if err := fs.Mkdir("/dst/sub", 0755); err != nil {
+		t.Fatalf("Mkdir: %v", err)
+	}
+	for path, data := range map[string]string{
+		"/dst/a.txt":     "error one\nok\nerror two\n",
+		"/dst/sub/b.txt": "error three\n",
+	} {
+		if _, err := fs.Write(path, []byte(data)); err != nil {
+			t.Fatalf("Write: %v", err)
+		}
+	}
+
+	post := func(body string) *http.Response {
+		resp, err := http.Post(server.URL+"/api/v1/grep", "application/json", strings.NewReader(body))
+		if err != nil {
+			t.Fatalf("POST: %v", err)
+		}
+		t.Cleanup(func() { resp.Body.Close() })
+		return resp
+	}
+
+	var result GrepResponse
+	resp := post(`{"path": "/dst", "pattern": "error", "recursive": true, "count_only": true}`)
+	if err := json.NewDecoder(resp.Body).Decode(&result); err != nil {
+		t.Fatalf("Decode: %v", err)
+	}
+	if result.Count != 3 || len(result.Matches) != 0 {
+		t.Errorf("expected count 3 and no matches, got %+v", result)
+	}
+
+	resp = post(`{"path": "/dst/a.txt", "pattern": "error", "stream": true, "count_only": true}`)
+	lines, err := io.ReadAll(resp.Body)
+	if err != nil {
+		t.Fatalf("ReadAll: %v", err)
+	}
+	var summary map[string]interface{}
+	if err := json.Unmarshal(lines, &summary); err != nil {
+		t.Fatalf("expected only a summary line, got %q: %v", lines, err)
+	}
+	if summary["type"] != "summary" || summary["count"] != float64(2) {
+		t.Errorf("unexpected summary: %v", summary)
+	}
+
+	resp = post(`{"path": "/dst", "pattern": "error", "count_only": true}`)
+	if resp.StatusCode != http.StatusBadRequest {
+		t.Errorf("directory without recursive: expected 400, got %d", resp.StatusCode)
+	}
+}
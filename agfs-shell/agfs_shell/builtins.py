@@ -2,30 +2,118 @@
 
 import re
 import os
-from typing import List
+from typing import List, Optional, Tuple
+from pyagfs import AGFSClientError, AGFSHTTPError
 from .process import Process
 from .command_decorators import command
+from .filesystem import READ_CHUNK_SIZE
+
+# Parallel per-file transfers for recursive upload/download
+TRANSFER_WORKERS = 8
+
+# Longest a recursive transfer holds back per-file progress lines (seconds)
+PROGRESS_FLUSH_INTERVAL = 0.25
+
+# Lines a command collects before writing them out in one call
+OUTPUT_BATCH_LINES = 256
+
+# Directory listings tree fetches ahead in parallel
+TREE_WORKERS = 8
+
+# Files larger than this are streamed from disk when uploaded rather than
+# read into memory first
+STREAM_UPLOAD_THRESHOLD = 4 * 1024 * 1024
+
+# Initial size of the range tail fetches from the end of a file
+TAIL_READ_SIZE = 8192
+
+# How often tail -f checks a file that can't be streamed for new data (seconds)
+TAIL_FOLLOW_INTERVAL = 1.0
+
+# Plugins whose streams push each write as it happens. Other filesystems'
+# streams just read the file through to EOF, so tail -f polls those instead
+PUSH_STREAM_PLUGINS = frozenset({'streamfs'})
+
+# Recursive uploads of at least this many files are sent as a single tar
+# request instead of one request per file
+BULK_MIN_FILES = 8
+
+
+# rwx strings for every 9-bit permission value, so ls -l formats a mode
+# with one lookup rather than nine bit tests per entry
+_RWX_TABLE = tuple(
+    ''.join(c if perms & (0o400 >> i) else '-' for i, c in enumerate('rwxrwxrwx'))
+    for perms in range(0o1000)
+)
 
 
 def _mode_to_rwx(mode: int) -> str:
     """Convert octal file mode to rwx string format"""
     # Handle both full mode (e.g., 0o100644) and just permissions (e.g., 0o644 or 420 decimal)
     # Extract last 9 bits for user/group/other permissions
-    perms = mode & 0o777
+    return _RWX_TABLE[mode & 0o777]
+
+
+def _format_mtime(mtime: str) -> str:
+    """Shorten a modification time to YYYY-MM-DD HH:MM:SS"""
+    # ISO format (2025-11-18T22:00:25.123+08:00) has the date and time in
+    # its first 19 chars, so one slice drops fractional seconds and zone
+    # instead of building a new string per replace/split
+    mtime = mtime[:19]
+    if 'T' in mtime:
+        mtime = mtime.replace('T', ' ', 1)
+    return mtime
 
-    def _triple(val):
-        """Convert 3-bit value to rwx"""
-        r = 'r' if val & 4 else '-'
-        w = 'w' if val & 2 else '-'
-        x = 'x' if val & 1 else '-'
-        return r + w + x
 
-    # Split into user, group, other (3 bits each)
-    user = (perms >> 6) & 7
-    group = (perms >> 3) & 7
-    other = perms & 7
+def _agfs_join(directory: str, name: str) -> str:
+    """Join an AGFS directory and a relative name; AGFS paths always use '/',
+    so this skips os.path.join's general handling in per-file loops"""
+    if directory.endswith('/'):
+        return directory + name
+    return directory + '/' + name
 
-    return _triple(user) + _triple(group) + _triple(other)
+
+def _into_directory(process: Process, dest: str, source: str, is_dir: bool = False) -> str:
+    """Return where source is copied to for dest: inside it if dest is a directory
+
+    is_dir says dest is already known to be a directory (e.g. it was given
+    with a trailing slash), which saves asking the server.
+    """
+    if not is_dir:
+        try:
+            if not process.filesystem.get_file_info(dest).get('isDir', False):
+                return dest
+        except Exception:
+            # Destination doesn't exist, use as-is
+            return dest
+    return os.path.normpath(os.path.join(dest, os.path.basename(source)))
+
+
+class _LineBuffer:
+    """Collects output lines and writes them to a stream in batches"""
+
+    def __init__(self, stream, batch_lines: int = OUTPUT_BATCH_LINES):
+        self.stream = stream
+        self.batch_lines = batch_lines
+        self.lines = []
+
+    def write(self, line: str):
+        self.lines.append(line)
+        if len(self.lines) >= self.batch_lines:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.stream.write(''.join(self.lines))
+            self.stream.flush()
+            self.lines.clear()
+
+
+def _parse_recursive_flag(args: List[str]) -> Tuple[bool, List[str]]:
+    """Split a leading -r off args, as taken by cp/upload/download"""
+    if args and args[0] == '-r':
+        return True, args[1:]
+    return False, list(args)
 
 
 @command()
@@ -88,7 +176,7 @@ def cmd_cat(process: Process) -> int:
                     # Fallback to local filesystem
                     with open(filename, 'rb') as f:
                         while True:
-                            chunk = f.read(8192)
+                            chunk = f.read(READ_CHUNK_SIZE)
                             if not chunk:
                                 break
                             process.stdout.write(chunk)
@@ -196,33 +284,59 @@ def cmd_grep(process: Process) -> int:
             count_only, files_only, False
         )
     else:
-        # Read from files
-        for filepath in files:
-            try:
-                # Read file content
-                content = process.filesystem.read_file(filepath)
-                if isinstance(content, bytes):
-                    content = content.decode('utf-8')
-
-                # Create a file-like object for the content
-                from io import StringIO
-                file_obj = StringIO(content)
-
-                matched = _grep_search(
-                    process, regex, filepath, invert_match, show_line_numbers,
-                    count_only, files_only, show_filename, file_obj
-                )
-
-                if matched:
-                    total_matched = True
-                    if files_only:
-                        # Already printed filename, move to next file
-                        continue
-
-            except FileNotFoundError:
-                process.stderr.write(f"grep: {filepath}: No such file or directory\n")
-            except Exception as e:
-                process.stderr.write(f"grep: {filepath}: {e}\n")
+        # Read from files; with several, reads run up to TRANSFER_WORKERS
+        # files ahead on a pool so their round trips overlap, while results
+        # are still taken (and printed) in order
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = None
+        reads = {}
+        if len(files) > 1:
+            pool = ThreadPoolExecutor(max_workers=min(TRANSFER_WORKERS, len(files)))
+            for ahead in range(min(TRANSFER_WORKERS, len(files))):
+                reads[ahead] = pool.submit(process.filesystem.read_file, files[ahead])
+        try:
+            for index, filepath in enumerate(files):
+                if pool is not None and index + TRANSFER_WORKERS < len(files):
+                    reads[index + TRANSFER_WORKERS] = pool.submit(
+                        process.filesystem.read_file, files[index + TRANSFER_WORKERS]
+                    )
+                try:
+                    # Read file content
+                    if pool is not None:
+                        content = reads.pop(index).result()
+                    else:
+                        content = process.filesystem.read_file(filepath)
+                    if isinstance(content, bytes):
+                        content = content.decode('utf-8')
+
+                    # Create a file-like object for the content
+                    from io import StringIO
+                    file_obj = StringIO(content)
+
+                    matched = _grep_search(
+                        process, regex, filepath, invert_match, show_line_numbers,
+                        count_only, files_only, show_filename, file_obj
+                    )
+
+                    if matched:
+                        total_matched = True
+                        if files_only:
+                            # Already printed filename, move to next file
+                            continue
+
+                except FileNotFoundError:
+                    process.stderr.write(f"grep: {filepath}: No such file or directory\n")
+                except Exception as e:
+                    process.stderr.write(f"grep: {filepath}: {e}\n")
+        finally:
+            if pool is not None:
+                # On any exit, including an error, a broken pipe or Ctrl+C,
+                # reads not yet started are cancelled; ones already running
+                # finish in the background and their results are dropped
+                for pending in reads.values():
+                    pending.cancel()
+                pool.shutdown(wait=False)
 
     return 0 if total_matched else 1
 
@@ -242,11 +356,14 @@ def _grep_search(process, regex, filename, invert_match, show_line_numbers,
         lines = file_obj.readlines()
 
     match_count = 0
-    line_number = 0
-
-    for line in lines:
-        line_number += 1
-
+    # Worked out once per file rather than per matching line: the bound
+    # search method and the filename part of the output prefix. Output is
+    # collected and written once at the end
+    search = regex.search
+    name_prefix = f"{filename}:" if show_filename and filename else ''
+    output = []
+
+    for line_number, line in enumerate(lines, 1):
         # Handle both str and bytes
         if isinstance(line, bytes):
             line_str = line.decode('utf-8', errors='replace')
@@ -257,7 +374,7 @@ def _grep_search(process, regex, filename, invert_match, show_line_numbers,
         line_clean = line_str.rstrip('\n\r')
 
         # Check if line matches
-        matches = bool(regex.search(line_clean))
+        matches = search(line_clean) is not None
         if invert_match:
             matches = not matches
 
@@ -271,21 +388,16 @@ def _grep_search(process, regex, filename, invert_match, show_line_numbers,
                 return True
 
             if not count_only:
-                # Build output line
-                output_parts = []
-
-                if show_filename and filename:
-                    output_parts.append(filename)
-
-                if show_line_numbers:
-                    output_parts.append(str(line_number))
-
                 # Format: filename:linenum:line or just line
-                if output_parts:
-                    prefix = ':'.join(output_parts) + ':'
-                    process.stdout.write(prefix + line_clean + '\n')
+                if show_line_numbers:
+                    output.append(f"{name_prefix}{line_number}:{line_clean}\n")
+                elif name_prefix:
+                    output.append(name_prefix + line_clean + '\n')
                 else:
-                    process.stdout.write(line_str if line_str.endswith('\n') else line_clean + '\n')
+                    output.append(line_str if line_str.endswith('\n') else line_clean + '\n')
+
+    if output:
+        process.stdout.write(''.join(output))
 
     # If count_only, print the count
     if count_only:
@@ -374,14 +486,117 @@ def cmd_head(process: Process) -> int:
     return 0
 
 
+def _tail_file(filesystem, path: str, n: int, size: int) -> bytes:
+    """Return the last n lines of an AGFS file of the given size
+
+    Reads a range off the end of the file, growing it 8x at a time until it
+    holds n line breaks or reaches the start, so a short tail of a large
+    file doesn't fetch the whole thing. Lines are found by scanning the raw
+    bytes backwards; nothing is decoded or split.
+    """
+    if size <= 0:
+        # Size unknown (e.g. a synthetic file) - read it all, exactly once
+        data = filesystem.read_file(path)
+        start = _tail_start(data, n)
+        return data[start:] if start >= 0 else data
+    chunk = TAIL_READ_SIZE
+    while True:
+        offset = max(0, size - chunk)
+        data = filesystem.read_file(path, offset=offset, size=size - offset)
+        start = _tail_start(data, n)
+        if start >= 0:
+            return data[start:]
+        if offset == 0:
+            return data
+        chunk *= 8
+
+
+def _tail_start(data: bytes, n: int) -> int:
+    """Return the index where the last n lines of data start, or -1 if it holds fewer"""
+    # A trailing newline ends the last line rather than starting another
+    pos = len(data) - 1 if data.endswith(b'\n') else len(data)
+    for _ in range(n):
+        pos = data.rfind(b'\n', 0, pos)
+        if pos < 0:
+            return -1
+    return pos + 1
+
+
+def _follow_file(process: Process, path: str, offset: int) -> int:
+    """Write data appended to an AGFS file past offset until interrupted"""
+    import time
+
+    try:
+        while True:
+            time.sleep(TAIL_FOLLOW_INTERVAL)
+            size = process.filesystem.get_file_info(path).get('size', 0)
+            if size < offset:
+                # Truncated - start again from the beginning
+                process.stderr.write(f"tail: {path}: file truncated\n")
+                offset = 0
+            if size > offset:
+                process.stdout.write(
+                    process.filesystem.read_file(path, offset=offset, size=size - offset)
+                )
+                process.stdout.flush()
+                offset = size
+    except KeyboardInterrupt:
+        return 130
+
+
+def _pushes_appends(process: Process, path: str) -> bool:
+    """Return whether path is mounted on a plugin whose streams deliver appends"""
+    try:
+        mounts = process.filesystem.client.mounts()
+    except AGFSClientError:
+        return False
+    # The deepest mount point containing path is the one serving it
+    plugin = None
+    depth = -1
+    for mount in mounts:
+        mount_path = mount.get('path', '').rstrip('/')
+        if (path == mount_path or path.startswith(mount_path + '/')) and len(mount_path) > depth:
+            plugin = mount.get('pluginName')
+            depth = len(mount_path)
+    return plugin in PUSH_STREAM_PLUGINS
+
+
+def _follow_stream(process: Process, path: str) -> Optional[int]:
+    """Write data pushed to a stream file as it arrives, until it ends or is interrupted
+
+    Only for filesystems in PUSH_STREAM_PLUGINS. Returns None if the file
+    can't be streamed after all, so the caller can fall back to polling.
+    """
+    try:
+        response = process.filesystem.client.cat(path, stream=True)
+    except AGFSClientError:
+        return None
+    try:
+        # The server pushes each write as it happens; nothing is polled
+        for chunk in response.iter_content(chunk_size=None):
+            if chunk:
+                process.stdout.write(chunk)
+                process.stdout.flush()
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        response.close()
+    return 0
+
+
 @command()
 def cmd_tail(process: Process) -> int:
     """
     Output the last part of files
 
-    Usage: tail [-n count]
+    Usage: tail [-f] [-n count] [file]
+
+    Options:
+        -f    Output data as it is appended to file
     """
     n = 10  # default
+    follow = False
+    path = None
 
     # Parse -n flag
     args = process.args[:]
@@ -395,8 +610,39 @@ def cmd_tail(process: Process) -> int:
             except ValueError:
                 process.stderr.write(f"tail: invalid number: {args[i + 1]}\n")
                 return 1
+        elif args[i] == '-f':
+            follow = True
+        elif not args[i].startswith('-'):
+            path = args[i]
         i += 1
 
+    if follow and path is None:
+        process.stderr.write("tail: -f requires a file\n")
+        return 1
+
+    if path is not None:
+        # Resolve path relative to current working directory
+        if not path.startswith('/'):
+            path = os.path.normpath(os.path.join(getattr(process, 'cwd', '/'), path))
+        try:
+            if follow and _pushes_appends(process, path):
+                result = _follow_stream(process, path)
+                if result is not None:
+                    return result
+            size = process.filesystem.get_file_info(path).get('size', 0)
+            process.stdout.write(_tail_file(process.filesystem, path, n, size))
+            if follow:
+                process.stdout.flush()
+                return _follow_file(process, path, size)
+        except Exception as e:
+            error_msg = str(e)
+            if "No such file or directory" in error_msg or "not found" in error_msg.lower():
+                process.stderr.write(f"tail: {path}: No such file or directory\n")
+            else:
+                process.stderr.write(f"tail: {path}: {error_msg}\n")
+            return 1
+        return 0
+
     # Read lines from stdin
     lines = process.stdin.readlines()
     for line in lines[-n:]:
@@ -475,25 +721,27 @@ def cmd_tr(process: Process) -> int:
     return 0
 
 
+_SIZE_UNITS = ('B', 'K', 'M', 'G', 'T', 'P')
+
+
 def _human_readable_size(size: int) -> str:
     """Convert size in bytes to human-readable format"""
-    units = ['B', 'K', 'M', 'G', 'T', 'P']
-    unit_index = 0
-    size_float = float(size)
+    size = int(size)
+    if size < 1024:
+        # Bytes - no decimal
+        return f"{size}B"
 
-    while size_float >= 1024.0 and unit_index < len(units) - 1:
-        size_float /= 1024.0
-        unit_index += 1
+    # Each unit is 2**10 of the one before, so the unit follows straight
+    # from the bit length rather than dividing by 1024 until it fits
+    unit_index = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    size_float = size / (1 << (10 * unit_index))
 
-    if unit_index == 0:
-        # Bytes - no decimal
-        return f"{int(size_float)}{units[unit_index]}"
-    elif size_float >= 10:
+    if size_float >= 10:
         # >= 10 - no decimal places
-        return f"{int(size_float)}{units[unit_index]}"
+        return f"{int(size_float)}{_SIZE_UNITS[unit_index]}"
     else:
         # < 10 - one decimal place
-        return f"{size_float:.1f}{units[unit_index]}"
+        return f"{size_float:.1f}{_SIZE_UNITS[unit_index]}"
 
 
 @command(needs_path_resolution=True)
@@ -534,6 +782,8 @@ def cmd_ls(process: Process) -> int:
     try:
         files = process.filesystem.list_directory(path)
 
+        # Rows are collected and written once, rather than one write per entry
+        lines = []
         for file_info in files:
             name = file_info.get('name', '')
             is_dir = file_info.get('isDir', False) or file_info.get('type') == 'directory'
@@ -559,12 +809,7 @@ def cmd_ls(process: Process) -> int:
                 mtime = file_info.get('modTime', file_info.get('mtime', ''))
                 if mtime:
                     # Format timestamp (YYYY-MM-DD HH:MM:SS)
-                    if 'T' in mtime:
-                        # ISO format: 2025-11-18T22:00:25Z
-                        mtime = mtime.replace('T', ' ').replace('Z', '').split('.')[0]
-                    elif len(mtime) > 19:
-                        # Truncate to 19 chars if too long
-                        mtime = mtime[:19]
+                    mtime = _format_mtime(mtime)
                 else:
                     mtime = '0000-00-00 00:00:00'
 
@@ -591,8 +836,10 @@ def cmd_ls(process: Process) -> int:
                 else:
                     output = f"{name}\n"
 
-            process.stdout.write(output.encode('utf-8'))
+            lines.append(output)
 
+        if lines:
+            process.stdout.write(''.join(lines).encode('utf-8'))
         return 0
     except Exception as e:
         error_msg = str(e)
@@ -644,7 +891,7 @@ def cmd_cd(process: Process) -> int:
     return 0
 
 
-@command(needs_path_resolution=True)
+@command(needs_path_resolution=True, modifies_filesystem=True)
 def cmd_mkdir(process: Process) -> int:
     """
     Create directory
@@ -671,7 +918,7 @@ def cmd_mkdir(process: Process) -> int:
         return 1
 
 
-@command(needs_path_resolution=True)
+@command(needs_path_resolution=True, modifies_filesystem=True)
 def cmd_touch(process: Process) -> int:
     """
     Touch file (update timestamp)
@@ -697,7 +944,7 @@ def cmd_touch(process: Process) -> int:
     return 0
 
 
-@command(needs_path_resolution=True)
+@command(needs_path_resolution=True, modifies_filesystem=True)
 def cmd_rm(process: Process) -> int:
     """
     Remove file or directory
@@ -1092,10 +1339,7 @@ def cmd_stat(process: Process) -> int:
         # Get modification time
         mtime = file_info.get('modTime', file_info.get('mtime', ''))
         if mtime:
-            if 'T' in mtime:
-                mtime = mtime.replace('T', ' ').replace('Z', '').split('.')[0]
-            elif len(mtime) > 19:
-                mtime = mtime[:19]
+            mtime = _format_mtime(mtime)
         else:
             mtime = 'unknown'
 
@@ -1119,27 +1363,41 @@ def cmd_stat(process: Process) -> int:
         return 1
 
 
-@command()
+@command(modifies_filesystem=True)
 def cmd_upload(process: Process) -> int:
     """
     Upload a local file or directory to AGFS
 
-    Usage: upload [-r] <local_path> <agfs_path>
+    Usage: upload [-r] [--parallel N] <local_path> <agfs_path>
+
+    Options:
+        -r              Upload a directory recursively
+        --parallel N    Files uploaded at once by a recursive upload
+                        (default: 8)
     """
     # Parse arguments
-    recursive = False
-    args = process.args[:]
-
-    if args and args[0] == '-r':
-        recursive = True
-        args = args[1:]
+    args = list(process.args)
+    workers = TRANSFER_WORKERS
+    if '--parallel' in args:
+        i = args.index('--parallel')
+        try:
+            workers = int(args[i + 1])
+        except (IndexError, ValueError):
+            workers = 0
+        if workers < 1:
+            process.stderr.write("upload: --parallel requires a positive number of files\n")
+            return 1
+        del args[i:i + 2]
+    recursive, args = _parse_recursive_flag(args)
 
     if len(args) != 2:
-        process.stderr.write("upload: usage: upload [-r] <local_path> <agfs_path>\n")
+        process.stderr.write("upload: usage: upload [-r] [--parallel N] <local_path> <agfs_path>\n")
         return 1
 
     local_path = args[0]
     agfs_path = args[1]
+    # A trailing slash already says the destination is a directory
+    dir_hint = agfs_path.endswith('/')
 
     # Resolve agfs_path relative to current working directory
     if not agfs_path.startswith('/'):
@@ -1152,17 +1410,9 @@ def cmd_upload(process: Process) -> int:
             process.stderr.write(f"upload: {local_path}: No such file or directory\n")
             return 1
 
-        # Check if destination is a directory
-        try:
-            dest_info = process.filesystem.get_file_info(agfs_path)
-            if dest_info.get('isDir', False):
-                # Destination is a directory, append source filename
-                source_basename = os.path.basename(local_path)
-                agfs_path = os.path.join(agfs_path, source_basename)
-                agfs_path = os.path.normpath(agfs_path)
-        except Exception:
-            # Destination doesn't exist, use as-is
-            pass
+        agfs_path = _into_directory(
+            process, agfs_path, local_path, dir_hint and os.path.isfile(local_path)
+        )
 
         if os.path.isfile(local_path):
             # Upload single file
@@ -1172,7 +1422,7 @@ def cmd_upload(process: Process) -> int:
                 process.stderr.write(f"upload: {local_path}: Is a directory (use -r to upload recursively)\n")
                 return 1
             # Upload directory recursively
-            return _upload_dir(process, local_path, agfs_path)
+            return _upload_dir(process, local_path, agfs_path, workers)
         else:
             process.stderr.write(f"upload: {local_path}: Not a file or directory\n")
             return 1
@@ -1183,15 +1433,77 @@ def cmd_upload(process: Process) -> int:
         return 1
 
 
+def _put_file(process: Process, local_path: str, agfs_path: str) -> int:
+    """Helper: Write a local file to AGFS, returning the number of bytes sent"""
+    with open(local_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > STREAM_UPLOAD_THRESHOLD:
+            # Hand over the file object so the body is read in chunks as
+            # it is sent, instead of holding the whole file in memory
+            process.filesystem.write_file(agfs_path, f, append=False)
+            return size
+        data = f.read()
+        process.filesystem.write_file(agfs_path, data, append=False)
+    return len(data)
+
+
+def _get_file(process: Process, agfs_path: str, local_path: str) -> int:
+    """Helper: Save an AGFS file locally, returning the number of bytes received"""
+    with open(local_path, 'wb') as f:
+        return process.filesystem.read_file_into(agfs_path, f)
+
+
+def _transfer_files(process: Process, name: str, transfer, pairs: List[Tuple[str, str]],
+                    workers: int = TRANSFER_WORKERS) -> int:
+    """
+    Helper: Run transfer(process, src, dst) for each (src, dst) pair on a pool
+    of workers threads, so per-file round trips overlap
+
+    Progress and errors are reported from this thread in submission order.
+    Progress lines are written in batches at most every
+    PROGRESS_FLUSH_INTERVAL seconds rather than flushed once per file.
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    verb = 'Uploaded' if name == 'upload' else 'Downloaded'
+    progress = []
+    last_flush = time.monotonic()
+
+    def flush_progress():
+        if progress:
+            process.stdout.write(''.join(progress))
+            process.stdout.flush()
+            progress.clear()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(transfer, process, src, dst) for src, dst in pairs]
+        for (src, dst), future in zip(pairs, futures):
+            try:
+                size = future.result()
+            except Exception as e:
+                # Stop at the first failure, like the sequential loop did
+                for pending in futures:
+                    pending.cancel()
+                flush_progress()
+                process.stderr.write(f"{name}: {src}: {str(e)}\n")
+                return 1
+            progress.append(f"{verb} {size} bytes to {dst}\n")
+            now = time.monotonic()
+            if now - last_flush >= PROGRESS_FLUSH_INTERVAL:
+                flush_progress()
+                last_flush = now
+    flush_progress()
+    return 0
+
+
 def _upload_file(process: Process, local_path: str, agfs_path: str, show_progress: bool = True) -> int:
     """Helper: Upload a single file to AGFS"""
     try:
-        with open(local_path, 'rb') as f:
-            data = f.read()
-            process.filesystem.write_file(agfs_path, data, append=False)
+        size = _put_file(process, local_path, agfs_path)
 
         if show_progress:
-            process.stdout.write(f"Uploaded {len(data)} bytes to {agfs_path}\n")
+            process.stdout.write(f"Uploaded {size} bytes to {agfs_path}\n")
             process.stdout.flush()
         return 0
 
@@ -1200,8 +1512,91 @@ def _upload_file(process: Process, local_path: str, agfs_path: str, show_progres
         return 1
 
 
-def _upload_dir(process: Process, local_path: str, agfs_path: str) -> int:
-    """Helper: Upload a directory recursively to AGFS"""
+class _ChunkSink:
+    """Write target for tarfile that collects written blocks until drained"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> List[bytes]:
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def _iter_tar(entries: List[Tuple[str, str]]):
+    """Yield a tar archive of (local path, archive name) entries as it is built"""
+    import tarfile
+
+    sink = _ChunkSink()
+    with tarfile.open(fileobj=sink, mode='w|', dereference=True) as tar:
+        for local_file, name in entries:
+            tar.add(local_file, arcname=name, recursive=False)
+            yield from sink.drain()
+    yield from sink.drain()
+
+
+def _scan_local_dir(local_path: str) -> Tuple[List[str], List[str]]:
+    """
+    Helper: Walk a local directory, returning the paths of its subdirectories
+    (parents before children) and of its files, relative to local_path
+
+    Uses os.scandir, whose entries carry their type from the directory read,
+    so classifying them needs no stat per entry. Like os.walk, symlinked
+    directories are listed but not descended into, and unreadable ones are
+    skipped.
+    """
+    dirs = []
+    files = []
+    pending = ['']
+    while pending:
+        rel = pending.pop()
+        try:
+            scanner = os.scandir(os.path.join(local_path, rel))
+        except OSError:
+            continue
+        with scanner:
+            for entry in scanner:
+                name = os.path.join(rel, entry.name) if rel else entry.name
+                if entry.is_dir():
+                    dirs.append(name)
+                    if not entry.is_symlink():
+                        pending.append(name)
+                else:
+                    files.append(name)
+    return dirs, files
+
+
+def _bulk_upload_dir(process: Process, local_path: str, agfs_path: str,
+                     dirs: List[str], files: List[str]) -> bool:
+    """Helper: Upload a scanned directory as one tar request; False means upload file by file"""
+    file_count = len(files)
+
+    # Not worth it for a handful of files
+    if file_count < BULK_MIN_FILES:
+        return False
+
+    # Directories first, so each file's parent is created before it
+    entries = [(os.path.join(local_path, name), name) for name in dirs + files]
+    try:
+        process.filesystem.client.bulk_upload(agfs_path, _iter_tar(entries))
+    except AGFSHTTPError:
+        # Server without the bulk endpoint; any other failure is a real
+        # error and is raised rather than retried file by file on top of
+        # whatever was already written
+        return False
+
+    process.stdout.write(f"Uploaded {file_count} files to {agfs_path}\n")
+    process.stdout.flush()
+    return True
+
+
+def _upload_dir(process: Process, local_path: str, agfs_path: str,
+                workers: int = TRANSFER_WORKERS) -> int:
+    """Helper: Upload a directory recursively to AGFS, up to workers files at once"""
     import stat as stat_module
 
     try:
@@ -1221,37 +1616,29 @@ def _upload_dir(process: Process, local_path: str, agfs_path: str) -> int:
                 process.stderr.write(f"upload: cannot create directory {agfs_path}: {str(e)}\n")
                 return 1
 
-        # Walk through local directory
-        for root, dirs, files in os.walk(local_path):
-            # Calculate relative path
-            rel_path = os.path.relpath(root, local_path)
-            if rel_path == '.':
-                current_agfs_dir = agfs_path
-            else:
-                current_agfs_dir = os.path.join(agfs_path, rel_path)
-                current_agfs_dir = os.path.normpath(current_agfs_dir)
+        dirs, files = _scan_local_dir(local_path)
 
-            # Create subdirectories in AGFS
-            for dirname in dirs:
-                dir_agfs_path = os.path.join(current_agfs_dir, dirname)
-                dir_agfs_path = os.path.normpath(dir_agfs_path)
-                try:
-                    process.filesystem.client.mkdir(dir_agfs_path)
-                except Exception:
-                    # Directory might already exist, ignore
-                    pass
-
-            # Upload files
-            for filename in files:
-                local_file = os.path.join(root, filename)
-                agfs_file = os.path.join(current_agfs_dir, filename)
-                agfs_file = os.path.normpath(agfs_file)
-
-                result = _upload_file(process, local_file, agfs_file)
-                if result != 0:
-                    return result
+        # Many files go up as one tar request if the server supports it
+        if _bulk_upload_dir(process, local_path, agfs_path, dirs, files):
+            return 0
 
-        return 0
+        # Scanned names are plain relative paths, so only the root needs
+        # normalizing; each AGFS path is then a single concatenation
+        agfs_path = os.path.normpath(agfs_path)
+
+        # Create subdirectories in AGFS, parents first
+        for name in dirs:
+            try:
+                process.filesystem.client.mkdir(_agfs_join(agfs_path, name))
+            except Exception:
+                # Directory might already exist, ignore
+                pass
+
+        pending = [
+            (os.path.join(local_path, name), _agfs_join(agfs_path, name))
+            for name in files
+        ]
+        return _transfer_files(process, 'upload', _put_file, pending, workers)
 
     except Exception as e:
         process.stderr.write(f"upload: {str(e)}\n")
@@ -1266,12 +1653,7 @@ def cmd_download(process: Process) -> int:
     Usage: download [-r] <agfs_path> <local_path>
     """
     # Parse arguments
-    recursive = False
-    args = process.args[:]
-
-    if args and args[0] == '-r':
-        recursive = True
-        args = args[1:]
+    recursive, args = _parse_recursive_flag(process.args)
 
     if len(args) != 2:
         process.stderr.write("download: usage: download [-r] <agfs_path> <local_path>\n")
@@ -1323,14 +1705,7 @@ def cmd_download(process: Process) -> int:
 def _download_file(process: Process, agfs_path: str, local_path: str, show_progress: bool = True) -> int:
     """Helper: Download a single file from AGFS"""
     try:
-        stream = process.filesystem.read_file(agfs_path, stream=True)
-        bytes_written = 0
-
-        with open(local_path, 'wb') as f:
-            for chunk in stream:
-                if chunk:
-                    f.write(chunk)
-                    bytes_written += len(chunk)
+        bytes_written = _get_file(process, agfs_path, local_path)
 
         if show_progress:
             process.stdout.write(f"Downloaded {bytes_written} bytes to {local_path}\n")
@@ -1342,42 +1717,84 @@ def _download_file(process: Process, agfs_path: str, local_path: str, show_progr
         return 1
 
 
+def _bulk_download_dir(process: Process, agfs_path: str, local_path: str) -> bool:
+    """Helper: Download a directory as one tar stream; False means download file by file"""
+    import shutil
+    import tarfile
+
+    try:
+        response = process.filesystem.client.bulk_download(agfs_path)
+    except AGFSHTTPError:
+        # Server has no bulk endpoint
+        return False
+
+    # A stream aborted part way is raised as an error like any other
+    root = os.path.realpath(local_path)
+    # Ends in exactly one separator, even when root is '/'
+    prefix = os.path.join(root, '')
+    file_count = 0
+    with response, tarfile.open(fileobj=response.raw, mode='r|') as tar:
+        for member in tar:
+            target = os.path.realpath(os.path.join(root, member.name))
+            if not target.startswith(prefix):
+                # Never write outside the destination
+                continue
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+            elif member.isfile():
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with tar.extractfile(member) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                file_count += 1
+
+    process.stdout.write(f"Downloaded {file_count} files to {local_path}\n")
+    process.stdout.flush()
+    return True
+
+
+def _collect_downloads(process: Process, agfs_path: str, local_path: str,
+                       pending: List[Tuple[str, str]]) -> None:
+    """Helper: Create the local directories under local_path and queue its files"""
+    os.makedirs(local_path, exist_ok=True)
+
+    # List AGFS directory
+    entries = process.filesystem.list_directory(agfs_path)
+
+    for entry in entries:
+        name = entry['name']
+        is_dir = entry.get('isDir', False)
+
+        agfs_item = _agfs_join(agfs_path, name)
+        local_item = os.path.join(local_path, name)
+
+        if is_dir:
+            # Recursively collect subdirectory
+            _collect_downloads(process, agfs_item, local_item, pending)
+        else:
+            pending.append((agfs_item, local_item))
+
+
 def _download_dir(process: Process, agfs_path: str, local_path: str) -> int:
     """Helper: Download a directory recursively from AGFS"""
     try:
         # Create local directory if it doesn't exist
         os.makedirs(local_path, exist_ok=True)
 
-        # List AGFS directory
-        entries = process.filesystem.list_directory(agfs_path)
-
-        for entry in entries:
-            name = entry['name']
-            is_dir = entry.get('isDir', False)
-
-            agfs_item = os.path.join(agfs_path, name)
-            agfs_item = os.path.normpath(agfs_item)
-            local_item = os.path.join(local_path, name)
-
-            if is_dir:
-                # Recursively download subdirectory
-                result = _download_dir(process, agfs_item, local_item)
-                if result != 0:
-                    return result
-            else:
-                # Download file
-                result = _download_file(process, agfs_item, local_item)
-                if result != 0:
-                    return result
+        # The whole tree comes down as one tar stream if the server supports it
+        if _bulk_download_dir(process, agfs_path, local_path):
+            return 0
 
-        return 0
+        # Walk the tree first, then fetch the files in parallel
+        pending = []
+        _collect_downloads(process, os.path.normpath(agfs_path), local_path, pending)
+        return _transfer_files(process, 'download', _get_file, pending)
 
     except Exception as e:
         process.stderr.write(f"download: {str(e)}\n")
         return 1
 
 
-@command()
+@command(modifies_filesystem=True)
 def cmd_cp(process: Process) -> int:
     """
     Copy files between local filesystem and AGFS
@@ -1389,12 +1806,7 @@ def cmd_cp(process: Process) -> int:
         cp [-r] <agfs_path1> <agfs_path2>  # Copy within AGFS
     """
     # Parse arguments
-    recursive = False
-    args = process.args[:]
-
-    if args and args[0] == '-r':
-        recursive = True
-        args = args[1:]
+    recursive, args = _parse_recursive_flag(process.args)
 
     if len(args) != 2:
         process.stderr.write("cp: usage: cp [-r] <source> <dest>\n")
@@ -1430,6 +1842,9 @@ def cmd_cp(process: Process) -> int:
 
 def _cp_upload(process: Process, local_path: str, agfs_path: str, recursive: bool = False) -> int:
     """Helper: Upload local file or directory to AGFS"""
+    # A trailing slash already says the destination is a directory
+    dir_hint = agfs_path.endswith('/')
+
     # Resolve agfs_path relative to current working directory
     if not agfs_path.startswith('/'):
         agfs_path = os.path.join(process.cwd, agfs_path)
@@ -1440,17 +1855,9 @@ def _cp_upload(process: Process, local_path: str, agfs_path: str, recursive: boo
             process.stderr.write(f"cp: {local_path}: No such file or directory\n")
             return 1
 
-        # Check if destination is a directory
-        try:
-            dest_info = process.filesystem.get_file_info(agfs_path)
-            if dest_info.get('isDir', False):
-                # Destination is a directory, append source filename
-                source_basename = os.path.basename(local_path)
-                agfs_path = os.path.join(agfs_path, source_basename)
-                agfs_path = os.path.normpath(agfs_path)
-        except Exception:
-            # Destination doesn't exist, use as-is
-            pass
+        agfs_path = _into_directory(
+            process, agfs_path, local_path, dir_hint and os.path.isfile(local_path)
+        )
 
         if os.path.isfile(local_path):
             # Show progress
@@ -1458,8 +1865,7 @@ def _cp_upload(process: Process, local_path: str, agfs_path: str, recursive: boo
             process.stdout.flush()
 
             # Upload file
-            with open(local_path, 'rb') as f:
-                process.filesystem.write_file(agfs_path, f.read(), append=False)
+            _put_file(process, local_path, agfs_path)
             return 0
 
         elif os.path.isdir(local_path):
@@ -1507,11 +1913,7 @@ def _cp_download(process: Process, agfs_path: str, local_path: str, recursive: b
             process.stdout.flush()
 
             # Download single file
-            stream = process.filesystem.read_file(agfs_path, stream=True)
-            with open(local_path, 'wb') as f:
-                for chunk in stream:
-                    if chunk:
-                        f.write(chunk)
+            _get_file(process, agfs_path, local_path)
             return 0
 
     except FileNotFoundError:
@@ -1536,6 +1938,9 @@ def _cp_agfs(process: Process, source_path: str, dest_path: str, recursive: bool
         source_path = os.path.join(process.cwd, source_path)
         source_path = os.path.normpath(source_path)
 
+    # A trailing slash already says the destination is a directory
+    dir_hint = dest_path.endswith('/')
+
     if not dest_path.startswith('/'):
         dest_path = os.path.join(process.cwd, dest_path)
         dest_path = os.path.normpath(dest_path)
@@ -1544,17 +1949,9 @@ def _cp_agfs(process: Process, source_path: str, dest_path: str, recursive: bool
         # Check if source is a directory
         info = process.filesystem.get_file_info(source_path)
 
-        # Check if destination is a directory
-        try:
-            dest_info = process.filesystem.get_file_info(dest_path)
-            if dest_info.get('isDir', False):
-                # Destination is a directory, append source filename
-                source_basename = os.path.basename(source_path)
-                dest_path = os.path.join(dest_path, source_basename)
-                dest_path = os.path.normpath(dest_path)
-        except Exception:
-            # Destination doesn't exist, use as-is
-            pass
+        dest_path = _into_directory(
+            process, dest_path, source_path, dir_hint and not info.get('isDir', False)
+        )
 
         if info.get('isDir', False):
             if not recursive:
@@ -1602,14 +1999,15 @@ def _cp_agfs_dir(process: Process, source_path: str, dest_path: str) -> int:
         # List source directory
         entries = process.filesystem.list_directory(source_path)
 
+        # Normalize both roots once; entries are then joined onto them
+        source_root = os.path.normpath(source_path)
+        dest_root = os.path.normpath(dest_path)
         for entry in entries:
             name = entry['name']
             is_dir = entry.get('isDir', False)
 
-            src_item = os.path.join(source_path, name)
-            src_item = os.path.normpath(src_item)
-            dst_item = os.path.join(dest_path, name)
-            dst_item = os.path.normpath(dst_item)
+            src_item = _agfs_join(source_root, name)
+            dst_item = _agfs_join(dest_root, name)
 
             if is_dir:
                 # Recursively copy subdirectory
@@ -1667,7 +2065,7 @@ def cmd_sleep(process: Process) -> int:
         return 130
 
 
-@command()
+@command(modifies_filesystem=True)
 def cmd_plugins(process: Process) -> int:
     """
     Manage external plugins
@@ -2086,6 +2484,8 @@ def cmd_tree(process: Process) -> int:
         -L level    Descend only level directories deep
         -d          List directories only
         -a          Show all files (including hidden files starting with .)
+        --max-entries N
+                    Show at most N entries per directory, then a count of the rest
         --noreport  Don't print file and directory count at the end
 
     Examples:
@@ -2094,9 +2494,11 @@ def cmd_tree(process: Process) -> int:
         tree -L 2           # Show tree with max depth of 2
         tree -d             # Show only directories
         tree -a             # Show all files including hidden ones
+        tree --max-entries 100  # Elide the rest of very large directories
     """
     # Parse arguments
     max_depth = None
+    max_entries = None
     dirs_only = False
     show_hidden = False
     show_report = True
@@ -2116,6 +2518,15 @@ def cmd_tree(process: Process) -> int:
             except ValueError:
                 process.stderr.write(f"tree: invalid level '{args[i + 1]}'\n")
                 return 1
+        elif args[i] == '--max-entries' and i + 1 < len(args):
+            try:
+                max_entries = int(args[i + 1])
+            except ValueError:
+                max_entries = -1
+            if max_entries < 0:
+                process.stderr.write(f"tree: invalid entry limit '{args[i + 1]}'\n")
+                return 1
+            i += 2
         elif args[i] == '-d':
             dirs_only = True
             i += 1
@@ -2127,8 +2538,8 @@ def cmd_tree(process: Process) -> int:
             i += 1
         elif args[i].startswith('-'):
             # Handle combined flags
-            if args[i] == '-L':
-                process.stderr.write("tree: option requires an argument -- 'L'\n")
+            if args[i] in ('-L', '--max-entries'):
+                process.stderr.write(f"tree: option requires an argument -- '{args[i].lstrip('-')}'\n")
                 return 1
             # Unknown option
             process.stderr.write(f"tree: invalid option -- '{args[i]}'\n")
@@ -2165,18 +2576,31 @@ def cmd_tree(process: Process) -> int:
             process.stderr.write(f"tree: {path}: {error_msg}\n")
         return 1
 
+    # Lines are written in batches rather than one write per entry
+    out = _LineBuffer(process.stdout)
+
     # Print the root path
-    process.stdout.write(f"{path}\n".encode('utf-8'))
+    out.write(f"{path}\n")
 
     # Track statistics
     stats = {'dirs': 0, 'files': 0}
 
-    # Build and print the tree
+    # Build and print the tree; subdirectory listings are fetched ahead on
+    # a small pool while earlier entries are printed
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ThreadPoolExecutor(max_workers=TREE_WORKERS)
     try:
-        _print_tree(process, path, "", True, max_depth, 0, dirs_only, show_hidden, stats)
+        _print_tree(process, path, max_depth, dirs_only, show_hidden, stats,
+                    pool=pool, out=out, max_entries=max_entries)
     except Exception as e:
+        out.flush()
         process.stderr.write(f"tree: error traversing {path}: {e}\n")
         return 1
+    finally:
+        # _print_tree cancelled any listings still queued; don't wait on
+        # the few already being fetched
+        pool.shutdown(wait=False)
 
     # Print report
     if show_report:
@@ -2184,35 +2608,54 @@ def cmd_tree(process: Process) -> int:
             report = f"\n{stats['dirs']} directories\n"
         else:
             report = f"\n{stats['dirs']} directories, {stats['files']} files\n"
-        process.stdout.write(report.encode('utf-8'))
+        out.write(report)
 
+    out.flush()
     return 0
 
 
-def _print_tree(process, path, prefix, is_last, max_depth, current_depth, dirs_only, show_hidden, stats):
+def _print_tree(process, path, max_depth, dirs_only, show_hidden, stats, pool=None, out=None,
+                max_entries=None):
     """
-    Recursively print directory tree
+    Print the directory tree under path, depth first
+
+    Walks with an explicit stack of per-directory frames instead of
+    recursing, so deep trees neither pay for a call per directory nor run
+    into the recursion limit.
 
     Args:
         process: Process object
-        path: Current directory path
-        prefix: Prefix string for tree drawing
-        is_last: Whether this is the last item in the parent directory
+        path: Root directory path
         max_depth: Maximum depth to traverse (None for unlimited)
-        current_depth: Current depth level
         dirs_only: Only show directories
         show_hidden: Show hidden files
         stats: Dictionary to track file/dir counts
+        pool: Executor to fetch subdirectory listings ahead on (optional)
+        out: _LineBuffer to write lines to (default: process stdout directly)
+        max_entries: Most entries shown per directory (None for unlimited);
+            the rest are counted but not printed, listed or descended into
     """
-    # Check depth limit
-    if max_depth is not None and current_depth >= max_depth:
-        return
+    if out is None:
+        out = process.stdout
 
-    try:
-        # List directory contents
-        entries = process.filesystem.list_directory(path)
+    def open_directory(dir_path, prefix, depth, listing):
+        """Read a directory into a stack frame, or print why it can't be read"""
+        try:
+            # List directory contents
+            if listing is not None:
+                entries = listing.result()
+            else:
+                entries = process.filesystem.list_directory(dir_path)
+        except Exception as e:
+            # If we can't read a directory, print an error but continue
+            error_msg = str(e)
+            if "Permission denied" in error_msg:
+                out.write(f"{prefix}[error opening dir]\n")
+            else:
+                out.write(f"{prefix}[error: {error_msg}]\n")
+            return None
 
-        # Filter entries
+        # Filter entries, working out each one's type once
         filtered_entries = []
         for entry in entries:
             name = entry.get('name', '')
@@ -2227,71 +2670,92 @@ def _print_tree(process, path, prefix, is_last, max_depth, current_depth, dirs_o
             if dirs_only and not is_dir:
                 continue
 
-            filtered_entries.append(entry)
+            filtered_entries.append((not is_dir, name))
 
         # Sort entries: directories first, then by name
-        filtered_entries.sort(key=lambda e: (not (e.get('isDir', False) or e.get('type') == 'directory'), e.get('name', '')))
+        filtered_entries.sort()
+
+        # Elide the rest of an oversized directory; they still count
+        # towards the totals but cost nothing further
+        hidden = 0
+        if max_entries is not None and len(filtered_entries) > max_entries:
+            hidden = len(filtered_entries) - max_entries
+            for is_file, _ in filtered_entries[max_entries:]:
+                stats['files' if is_file else 'dirs'] += 1
+            del filtered_entries[max_entries:]
+
+        # Request every subdirectory listing that will be descended into
+        # now, so they overlap each other and the printing of this level
+        listings = {}
+        if pool is not None and (max_depth is None or depth + 1 < max_depth):
+            for is_file, name in filtered_entries:
+                if not is_file:
+                    listings[name] = pool.submit(
+                        process.filesystem.list_directory, _agfs_join(dir_path, name)
+                    )
+
+        # Tree drawing for this level, built once rather than per entry:
+        # the line prefix for middle and last entries, and the prefix their
+        # children are drawn with
+        # With entries elided, the summary line is drawn as the last one
+        return (
+            dir_path, depth, enumerate(filtered_entries),
+            len(filtered_entries) - (0 if hidden else 1), hidden, listings,
+            (prefix + "├── ", prefix + "│   "), (prefix + "└── ", prefix + "    "),
+        )
 
-        # Process each entry
-        for idx, entry in enumerate(filtered_entries):
-            name = entry.get('name', '')
-            is_dir = entry.get('isDir', False) or entry.get('type') == 'directory'
-            is_last_entry = (idx == len(filtered_entries) - 1)
+    # Check depth limit
+    if max_depth is not None and max_depth <= 0:
+        return
 
-            # Update statistics
-            if is_dir:
-                stats['dirs'] += 1
-            else:
-                stats['files'] += 1
+    # Normalized once here; every path below it is joined onto this
+    stack = []
+    frame = open_directory(os.path.normpath(path), "", 0, None)
+    if frame is not None:
+        stack.append(frame)
 
-            # Determine the tree characters to use
-            if is_last_entry:
-                connector = "└── "
-                extension = "    "
-            else:
-                connector = "├── "
-                extension = "│   "
+    try:
+        while stack:
+            dir_path, depth, entries, last_idx, hidden, listings, branch, last = stack[-1]
+            step = next(entries, None)
+            if step is None:
+                if hidden:
+                    out.write(f"{last[0]}... {hidden} more entries\n")
+                # Directory done - carry on with its parent
+                stack.pop()
+                continue
+            idx, (is_file, name) = step
+            line_prefix, child_prefix = last if idx == last_idx else branch
 
-            # Format name with color
-            if is_dir:
-                # Blue color for directories
-                display_name = f"\033[1;34m{name}/\033[0m"
-            else:
-                display_name = name
+            if is_file:
+                stats['files'] += 1
+                out.write(line_prefix + name + "\n")
+                continue
 
-            # Print the entry
-            line = f"{prefix}{connector}{display_name}\n"
-            process.stdout.write(line.encode('utf-8'))
+            stats['dirs'] += 1
 
-            # Recursively process subdirectories
-            if is_dir:
-                subdir_path = os.path.join(path, name)
-                subdir_path = os.path.normpath(subdir_path)
-                new_prefix = prefix + extension
-
-                _print_tree(
-                    process,
-                    subdir_path,
-                    new_prefix,
-                    is_last_entry,
-                    max_depth,
-                    current_depth + 1,
-                    dirs_only,
-                    show_hidden,
-                    stats
-                )
+            # Blue color for directories
+            out.write(line_prefix + "\033[1;34m" + name + "/\033[0m\n")
 
-    except Exception as e:
-        # If we can't read a directory, print an error but continue
-        error_msg = str(e)
-        if "Permission denied" in error_msg:
-            error_line = f"{prefix}[error opening dir]\n"
-        else:
-            error_line = f"{prefix}[error: {error_msg}]\n"
-        process.stdout.write(error_line.encode('utf-8'))
+            # Descend into the subdirectory next, within the depth limit
+            if max_depth is None or depth + 1 < max_depth:
+                frame = open_directory(
+                    _agfs_join(dir_path, name),
+                    child_prefix,
+                    depth + 1,
+                    listings.get(name)
+                )
+                if frame is not None:
+                    stack.append(frame)
+    finally:
+        # On an error or Ctrl+C part way, cancel the listings still queued
+        # for the unfinished directories so the pool doesn't fetch them
+        for frame in stack:
+            for listing in frame[5].values():
+                listing.cancel()
 
 
-@command(needs_path_resolution=True)
+@command(needs_path_resolution=True, modifies_filesystem=True)
 def cmd_mv(process: Process) -> int:
     """
     Move (rename) files and directories
@@ -2465,16 +2929,20 @@ def _mv_single(process, source_path, dest_path, source_is_local, dest_is_local,
             final_dest = os.path.join(dest_path, source_basename)
             final_dest = os.path.normpath(final_dest)
 
-    # Check if final destination exists
+    # Check if final destination exists; only overwrite protection needs
+    # to know, and when it is dest itself the probe above already answered
     final_dest_exists = False
-    if dest_is_local:
-        final_dest_exists = os.path.exists(final_dest)
-    else:
-        try:
-            process.filesystem.get_file_info(final_dest)
-            final_dest_exists = True
-        except:
-            final_dest_exists = False
+    if no_clobber or interactive:
+        if final_dest == dest_path:
+            final_dest_exists = dest_exists
+        elif dest_is_local:
+            final_dest_exists = os.path.exists(final_dest)
+        else:
+            try:
+                process.filesystem.get_file_info(final_dest)
+                final_dest_exists = True
+            except:
+                final_dest_exists = False
 
     # Handle overwrite protection
     if final_dest_exists:
@@ -2513,9 +2981,7 @@ def _mv_single(process, source_path, dest_path, source_is_local, dest_is_local,
                 return result
             else:
                 # Move file
-                with open(source_path, 'rb') as f:
-                    data = f.read()
-                    process.filesystem.write_file(final_dest, data, append=False)
+                _put_file(process, source_path, final_dest)
                 # Delete local file after successful upload
                 os.remove(source_path)
                 return 0
@@ -2534,11 +3000,7 @@ def _mv_single(process, source_path, dest_path, source_is_local, dest_is_local,
                 return result
             else:
                 # Move file
-                stream = process.filesystem.read_file(source_path, stream=True)
-                with open(final_dest, 'wb') as f:
-                    for chunk in stream:
-                        if chunk:
-                            f.write(chunk)
+                _get_file(process, source_path, final_dest)
                 # Delete AGFS file after successful download
                 process.filesystem.client.rm(source_path, recursive=False)
                 return 0
@@ -2713,7 +3175,7 @@ def cmd_help(process: Process) -> int:
     return 0
 
 
-@command()
+@command(modifies_filesystem=True)
 def cmd_mount(process: Process) -> int:
     """
     Mount a plugin dynamically or list mounted filesystems
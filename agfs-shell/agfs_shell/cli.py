@@ -3,10 +3,24 @@
 import sys
 import os
 import argparse
-from .shell import Shell
 from .config import Config
 
 
+# Command line arguments as (flags, add_argument options)
+CLI_ARGUMENTS = (
+    (('--agfs-api-url',), dict(dest='agfs_api_url', default=None,
+                               help='AGFS API URL (default: http://localhost:8080 or $AGFS_API_URL)')),
+    (('--timeout',), dict(dest='timeout', type=int, default=None,
+                          help='Request timeout in seconds (default: 30 or $AGFS_TIMEOUT)')),
+    (('-c',), dict(dest='command_string', default=None,
+                   help='Execute command string')),
+    (('--help', '-h'), dict(action='store_true',
+                            help='Show this help message')),
+    (('script',), dict(nargs='?', help='Script file to execute')),
+    (('args',), dict(nargs='*', help='Arguments to script (or command if no script)')),
+)
+
+
 def execute_script_file(shell, script_path):
     """Execute a script file line by line"""
     try:
@@ -100,23 +114,8 @@ def main():
         description='agfs-shell - Experimental shell with AGFS integration',
         add_help=False  # We'll handle help ourselves
     )
-    parser.add_argument('--agfs-api-url',
-                        dest='agfs_api_url',
-                        help='AGFS API URL (default: http://localhost:8080 or $AGFS_API_URL)',
-                        default=None)
-    parser.add_argument('--timeout',
-                        dest='timeout',
-                        type=int,
-                        help='Request timeout in seconds (default: 30 or $AGFS_TIMEOUT)',
-                        default=None)
-    parser.add_argument('-c',
-                        dest='command_string',
-                        help='Execute command string',
-                        default=None)
-    parser.add_argument('--help', '-h', action='store_true',
-                        help='Show this help message')
-    parser.add_argument('script', nargs='?', help='Script file to execute')
-    parser.add_argument('args', nargs='*', help='Arguments to script (or command if no script)')
+    for flags, options in CLI_ARGUMENTS:
+        parser.add_argument(*flags, **options)
 
     args = parser.parse_args()
 
@@ -128,6 +127,9 @@ def main():
     # Create configuration
     config = Config.from_args(server_url=args.agfs_api_url, timeout=args.timeout)
 
+    # Imported here so --help doesn't load the shell, builtins and HTTP client
+    from .shell import Shell
+
     # Initialize shell with configuration
     shell = Shell(server_url=config.server_url, timeout=config.timeout)
 
@@ -59,6 +59,11 @@ class CommandMetadata:
         """Check if command changes the current working directory"""
         return cls.get_metadata(command_name).get('changes_cwd', False)
 
+    @classmethod
+    def modifies_filesystem(cls, command_name: str) -> bool:
+        """Check if command may create, remove or remount AGFS paths"""
+        return cls.get_metadata(command_name).get('modifies_filesystem', False)
+
     @classmethod
     def get_path_arg_indices(cls, command_name: str) -> Optional[Set[int]]:
         """
@@ -97,6 +102,7 @@ def command(
     supports_streaming: bool = False,
     no_pipeline: bool = False,
     changes_cwd: bool = False,
+    modifies_filesystem: bool = False,
     path_arg_indices: Optional[Set[int]] = None
 ):
     """
@@ -108,6 +114,7 @@ def command(
         supports_streaming: Whether command supports streaming I/O
         no_pipeline: Whether command cannot be used in pipelines
         changes_cwd: Whether command changes current working directory
+        modifies_filesystem: Whether command may create, remove or remount AGFS paths
         path_arg_indices: Set of argument indices that are paths (None = all non-flag args)
 
     Example:
@@ -124,6 +131,7 @@ def command(
             'supports_streaming': supports_streaming,
             'no_pipeline': no_pipeline,
             'changes_cwd': changes_cwd,
+            'modifies_filesystem': modifies_filesystem,
             'path_arg_indices': path_arg_indices,
         }
 
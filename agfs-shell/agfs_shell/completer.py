@@ -1,19 +1,64 @@
 """Tab completion support for agfs-shell"""
 
+import bisect
 import os
-from typing import List, Optional
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from pyagfs import AGFSClientError
 from .builtins import BUILTINS
+from .command_decorators import CommandMetadata
 from .filesystem import AGFSFileSystem
 
+# How long a directory listing is reused for completion (seconds)
+LS_CACHE_TTL = 2.0
+
+# How long a directory that failed to list is not asked for again (seconds)
+BAD_PATH_TTL = 5.0
+
+# Upper bound on the number of directory listings kept for completion
+LS_CACHE_SIZE = 64
+
+# Identical completion requests within this window reuse the previous
+# matches (seconds; long enough to cover a double Tab)
+COMPLETION_DEBOUNCE = 0.5
+
+# Commands after which cached listings may be stale, as declared by their
+# @command(modifies_filesystem=True) registration
+MUTATING_COMMANDS = frozenset(CommandMetadata.get_commands_with_feature('modifies_filesystem'))
+
+
+# Command names, sorted once at import for bisect
+COMMAND_NAMES = tuple(sorted(BUILTINS))
+
+
+def _entry_name(entry: dict) -> str:
+    return entry.get('name', '')
+
 
 class ShellCompleter:
     """Tab completion for shell commands and AGFS paths"""
 
     def __init__(self, filesystem: AGFSFileSystem):
         self.filesystem = filesystem
-        self.command_names = sorted(BUILTINS.keys())
+        self.command_names = COMMAND_NAMES
         self.matches = []
+        self._last_request: Optional[Tuple[str, int, float]] = None  # (line, begin, time)
         self.shell = None  # Will be set by shell to access cwd
+        # Directory listings keyed by path, so repeated Tab presses while
+        # editing one line don't each cost a round-trip to the server
+        # Each value is (fetch time, entries sorted by name, their names)
+        self._ls_cache: 'OrderedDict[str, Tuple[float, List[dict], List[str]]]' = OrderedDict()
+        # Listings fetched in the background ahead of the next Tab, with the
+        # time each was requested; results stay in the futures until
+        # _list_directory (on the main thread) moves them into the cache, so
+        # worker threads never touch the cache dicts
+        self._inflight: Dict[str, Tuple[float, Future]] = {}
+        # Directories whose listing failed, by time of failure, so typing
+        # under a missing or inaccessible path doesn't retry on every Tab
+        self._bad_paths: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def complete(self, text: str, state: int) -> Optional[str]:
         """
@@ -33,101 +78,181 @@ class ShellCompleter:
             begin_idx = readline.get_begidx()
             end_idx = readline.get_endidx()
 
-            # Determine if we're completing a command or a path
-            if begin_idx == 0 or line[:begin_idx].strip() == '':
-                # Beginning of line - complete command names
-                self.matches = self._complete_command(text)
-            else:
-                # Middle of line - complete paths
-                self.matches = self._complete_path(text)
+            # Readline asks again for the same word on a double Tab; reuse
+            # the matches rather than filtering the listing a second time
+            line = line[:end_idx]
+            now = time.monotonic()
+            last = self._last_request
+            self._last_request = (line, begin_idx, now)
+            if last is None or last[:2] != (line, begin_idx) or now - last[2] >= COMPLETION_DEBOUNCE:
+                # Determine if we're completing a command or a path
+                if begin_idx == 0 or line[:begin_idx].isspace():
+                    # Beginning of line - complete command names
+                    self.matches = self._complete_command(text)
+                else:
+                    # Middle of line - complete paths
+                    self.matches = self._complete_path(text)
 
         # Return the next match
         if state < len(self.matches):
             return self.matches[state]
         return None
 
+    def invalidate(self, path: Optional[str] = None):
+        """Drop cached listings for path and its parent, or all of them if path is None"""
+        if path is None:
+            self._ls_cache.clear()
+            self._inflight.clear()
+            self._bad_paths.clear()
+            return
+        path = os.path.normpath(path)
+        for key in (path, os.path.dirname(path)):
+            self._ls_cache.pop(key, None)
+            self._inflight.pop(key, None)
+            self._bad_paths.pop(key, None)
+
+    def invalidate_after(self, command: str):
+        """Drop all cached listings if command may have changed the filesystem"""
+        if '>' in command or not MUTATING_COMMANDS.isdisjoint(command.split()):
+            self.invalidate()
+
+    def _store(self, directory: str, entries: List[dict], now: float) -> Tuple[List[dict], List[str]]:
+        """Cache a listing, evicting the least recently stored ones past LS_CACHE_SIZE"""
+        # Sorted once here, with the names alongside, so each completion
+        # against it can bisect to the first match
+        entries = sorted(entries, key=_entry_name)
+        names = [_entry_name(entry) for entry in entries]
+        cache = self._ls_cache
+        cache[directory] = (now, entries, names)
+        cache.move_to_end(directory)
+        while len(cache) > LS_CACHE_SIZE:
+            cache.popitem(last=False)
+        return entries, names
+
+    def seed(self, directory: str, entries: List[dict]):
+        """Cache a listing fetched elsewhere (e.g. at startup)"""
+        self._store(os.path.normpath(directory), entries, time.monotonic())
+
+    def prefetch(self, directory: str):
+        """Start fetching a directory listing in the background"""
+        directory = os.path.normpath(directory)
+        cached = self._ls_cache.get(directory)
+        if cached is not None and time.monotonic() - cached[0] < LS_CACHE_TTL:
+            return
+        if directory in self._inflight:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agfs-complete")
+        self._inflight[directory] = (
+            time.monotonic(), self._executor.submit(self.filesystem.list_directory, directory)
+        )
+
+    def _list_directory(self, directory: str) -> Tuple[List[dict], List[str]]:
+        """List a directory as (entries, names) sorted by name, reusing a listing
+        fetched within LS_CACHE_TTL"""
+        directory = os.path.normpath(directory)
+        now = time.monotonic()
+        cached = self._ls_cache.get(directory)
+        if cached is not None and now - cached[0] < LS_CACHE_TTL:
+            return cached[1], cached[2]
+        failed = self._bad_paths.get(directory)
+        if failed is not None and now - failed < BAD_PATH_TTL:
+            return [], []
+        # An invalidated prefetch has already been dropped from _inflight;
+        # one requested longer than LS_CACHE_TTL ago is too old to use
+        prefetched = self._inflight.pop(directory, None)
+        future = None
+        if prefetched is not None and now - prefetched[0] < LS_CACHE_TTL:
+            future = prefetched[1]
+        try:
+            if future is not None:
+                # Already being fetched - wait for it rather than asking twice
+                entries = future.result()
+            else:
+                entries = self.filesystem.list_directory(directory)
+        except AGFSClientError:
+            self._bad_paths[directory] = now
+            raise
+        self._bad_paths.pop(directory, None)
+        return self._store(directory, entries, now)
+
     def _complete_command(self, text: str) -> List[str]:
         """Complete command names"""
         if not text:
-            return self.command_names
+            return list(self.command_names)
 
-        matches = [cmd for cmd in self.command_names if cmd.startswith(text)]
-        return matches
+        # Names sharing a prefix are contiguous in the sorted list, so only
+        # the matching range is scanned
+        names = self.command_names
+        start = bisect.bisect_left(names, text)
+        end = start
+        while end < len(names) and names[end].startswith(text):
+            end += 1
+        return list(self.command_names[start:end])
 
     def _complete_path(self, text: str) -> List[str]:
         """Complete AGFS paths"""
         # Get current working directory
         cwd = self.shell.cwd if self.shell else '/'
 
-        # Handle empty text - list current directory
-        if not text:
-            text = '.'
-
-        # Resolve relative paths
-        if text.startswith('/'):
-            # Absolute path
-            full_text = text
-        else:
-            # Relative path - resolve against cwd
-            full_text = os.path.join(cwd, text)
-            full_text = os.path.normpath(full_text)
-
-        # Split path into directory and partial filename
-        if full_text.endswith('/'):
-            # Directory path - list contents
-            directory = full_text
-            partial = ''
+        # One scan for the last slash splits the word into the directory
+        # to list and the partial name to match; only the directory part
+        # needs resolving against cwd
+        slash = text.rfind('/')
+        head = text[:slash + 1]
+        partial = text[slash + 1:]
+        if head.startswith('/'):
+            directory = head
+        elif head:
+            directory = os.path.normpath(os.path.join(cwd, head))
         else:
-            # Partial path - split into dir and filename
-            directory = os.path.dirname(full_text)
-            partial = os.path.basename(full_text)
-
-            # Handle current directory
-            if not directory or directory == '.':
-                directory = cwd
-            elif not directory.startswith('/'):
-                directory = os.path.join(cwd, directory)
-                directory = os.path.normpath(directory)
+            directory = cwd
 
         # Get directory listing from AGFS
         try:
-            entries = self.filesystem.list_directory(directory)
+            entries, names = self._list_directory(directory)
 
-            # Determine if we should return relative or absolute paths
-            return_relative = not text.startswith('/')
+            # Loop invariants, worked out once rather than per entry: the
+            # prefix every match is built on, and the cwd prefix stripped
+            # from matches to make them relative
+            base = directory.rstrip('/') + '/'
+            relative_to = None
+            if not text.startswith('/') and cwd != '/':
+                relative_to = cwd + '/'
+            skip = len(relative_to) if relative_to else 0
 
-            # Filter by partial match and construct paths
+            # Names sharing the partial prefix are contiguous in the sorted
+            # listing: bisect to the first and stop after the last
             matches = []
-            for entry in entries:
-                name = entry.get('name', '')
-                if name and name.startswith(partial):
-                    # Construct absolute path
-                    if directory == '/':
-                        abs_path = f"/{name}"
-                    else:
-                        # Remove trailing slash from directory before joining
-                        dir_clean = directory.rstrip('/')
-                        abs_path = f"{dir_clean}/{name}"
+            for i in range(bisect.bisect_left(names, partial), len(names)):
+                name = names[i]
+                if not name.startswith(partial):
+                    break
+                if name:
+                    entry = entries[i]
+                    abs_path = base + name
 
                     # Add trailing slash for directories
                     if entry.get('type') == 'directory':
                         abs_path += '/'
 
                     # Convert to relative path if needed
-                    if return_relative and cwd != '/':
-                        # Make path relative to cwd
-                        if abs_path.startswith(cwd + '/'):
-                            rel_path = abs_path[len(cwd) + 1:]
-                            matches.append(rel_path)
-                        elif abs_path == cwd:
-                            matches.append('.')
-                        else:
-                            # Path not under cwd, use absolute
-                            matches.append(abs_path)
+                    if relative_to is None:
+                        matches.append(abs_path)
+                    elif abs_path.startswith(relative_to):
+                        matches.append(abs_path[skip:])
+                    elif abs_path == cwd:
+                        matches.append('.')
                     else:
+                        # Path not under cwd, use absolute
                         matches.append(abs_path)
 
+            # A single directory match is usually descended into next;
+            # fetch it now so the following Tab doesn't wait on the server
+            if len(matches) == 1 and matches[0].endswith('/'):
+                self.prefetch(abs_path)
+
             return sorted(matches)
-        except Exception:
+        except AGFSClientError:
             # If directory listing fails, return no matches
             return []
@@ -1,8 +1,13 @@
 """AGFS File System abstraction layer"""
 
-from typing import BinaryIO, Iterator, Optional, Union
+from functools import cached_property
+from typing import BinaryIO, Iterator, List, Optional, Union
 
-from pyagfs import AGFSClient, AGFSClientError
+from pyagfs import AGFSClientError
+
+# Chunk size for streamed reads; large enough that per-chunk overhead
+# (iteration, writes, flushes) stops mattering for big files
+READ_CHUNK_SIZE = 64 * 1024
 
 
 class AGFSFileSystem:
@@ -19,9 +24,16 @@ class AGFSFileSystem:
                     - Each 8KB chunk upload/download should complete within this time
         """
         self.server_url = server_url
-        self.client = AGFSClient(server_url, timeout=timeout)
+        self.timeout = timeout
         self._connected = False
 
+    @cached_property
+    def client(self):
+        """AGFS client, created on first use so commands that never reach
+        the server don't load the HTTP stack"""
+        from pyagfs import AGFSClient
+        return AGFSClient(self.server_url, timeout=self.timeout)
+
     def check_connection(self) -> bool:
         """Check if AGFS server is accessible"""
         if self._connected:
@@ -35,6 +47,21 @@ class AGFSFileSystem:
             # Catch all exceptions (ConnectionError, AGFSClientError, etc.)
             return False
 
+    def startup_info(self) -> Optional[List[dict]]:
+        """
+        Check the server is accessible, fetching the root listing in the same request
+
+        Returns:
+            Root directory entries ([] if the server is up but / can't be listed),
+            or None if the server cannot be reached
+        """
+        try:
+            entries = self.client.ls("/")
+        except Exception:
+            return [] if self.check_connection() else None
+        self._connected = True
+        return entries
+
     def read_file(
         self, path: str, offset: int = 0, size: int = -1, stream: bool = False
     ) -> Union[bytes, Iterator[bytes]]:
@@ -61,7 +88,7 @@ class AGFSFileSystem:
                     response = self.client.cat(
                         path, offset=offset, size=size, stream=True
                     )
-                    return response.iter_content(chunk_size=8192)
+                    return response.iter_content(chunk_size=READ_CHUNK_SIZE)
                 except AGFSClientError as e:
                     # Fallback to regular read and simulate streaming
                     content = self.client.cat(
@@ -69,7 +96,7 @@ class AGFSFileSystem:
                     )
 
                     # Return iterator that yields chunks
-                    def chunk_generator(data, chunk_size=8192):
+                    def chunk_generator(data, chunk_size=READ_CHUNK_SIZE):
                         for i in range(0, len(data), chunk_size):
                             yield data[i : i + chunk_size]
 
@@ -81,6 +108,26 @@ class AGFSFileSystem:
             # SDK error already includes path, don't duplicate it
             raise AGFSClientError(str(e))
 
+    def read_file_into(self, path: str, fileobj: BinaryIO) -> int:
+        """
+        Copy file content from AGFS into a local binary file object
+
+        Args:
+            path: File path in AGFS
+            fileobj: Destination opened for binary writing
+
+        Returns:
+            Number of bytes copied
+
+        Raises:
+            AGFSClientError: If file cannot be read
+        """
+        try:
+            return self.client.cat_into(path, fileobj)
+        except AGFSClientError as e:
+            # SDK error already includes path, don't duplicate it
+            raise AGFSClientError(str(e))
+
     def write_file(
         self,
         path: str,
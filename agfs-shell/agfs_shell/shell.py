@@ -2,8 +2,8 @@
 
 import sys
 import os
+from functools import cached_property
 from typing import Optional, List
-from rich.console import Console
 from .parser import CommandParser
 from .pipeline import Pipeline
 from .process import Process
@@ -13,6 +13,40 @@ from .filesystem import AGFSFileSystem
 from .command_decorators import CommandMetadata
 from pyagfs import AGFSClientError
 
+# Largest chunk sent per request when streaming stdin into a file
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def _read_available(stream, size: int) -> bytes:
+    """
+    Read up to size bytes from a binary stream: wait for the first data, then
+    take only what is already waiting
+
+    A single read1 on a pipe returns at most the pipe buffer (64 KiB on
+    Linux), so a fast producer keeps being read while select says more is
+    ready, filling the chunk; a slow one still gets each write sent as it
+    arrives. Streams select can't watch (e.g. pipes on Windows) get one read1.
+    """
+    import select
+
+    chunk = stream.read1(size)
+    if not chunk or len(chunk) >= size:
+        return chunk
+    parts = [chunk]
+    filled = len(chunk)
+    try:
+        fd = stream.fileno()
+        while filled < size and select.select([fd], [], [], 0)[0]:
+            more = stream.read1(size - filled)
+            if not more:
+                # EOF; the next call returns b'' and ends the stream
+                break
+            parts.append(more)
+            filled += len(more)
+    except (OSError, ValueError):
+        pass
+    return b''.join(parts)
+
 
 class Shell:
     """Simple shell with pipeline support"""
@@ -23,7 +57,6 @@ class Shell:
         self.filesystem = AGFSFileSystem(server_url, timeout=timeout)
         self.server_url = server_url
         self.cwd = '/'  # Current working directory
-        self.console = Console(highlight=False)  # Rich console for output
         self.multiline_buffer = []  # Buffer for multiline input
         self.env = {}  # Environment variables
         self.env['?'] = '0'  # Last command exit code
@@ -34,6 +67,19 @@ class Shell:
         self.env['HISTFILE'] = os.path.join(home, ".agfs_shell_history")
 
         self.interactive = False  # Flag to indicate if running in interactive REPL mode
+        self.completer = None  # Tab completer, set up by repl() when readline is available
+        self._prompt_cwd = None  # cwd the cached prompt was built for
+        self._prompt_text = ''
+
+    @cached_property
+    def console(self):
+        """Rich console for output, created on first use.
+
+        Importing rich pulls in dozens of modules; one-shot commands that never
+        print through the console (e.g. output redirected to a file) skip it.
+        """
+        from rich.console import Console
+        return Console(highlight=False)
 
     def _execute_command_substitution(self, command: str) -> str:
         """
@@ -155,9 +201,10 @@ class Shell:
         Returns:
             List of (cmd, expanded_args) tuples
         """
-        import fnmatch
-
         expanded_commands = []
+        # Listings fetched so far for this command line, so several patterns
+        # in one directory (cat *.txt *.log) share a single request
+        listings = {}
 
         for cmd, args in commands:
             expanded_args = []
@@ -166,7 +213,7 @@ class Shell:
                 # Check if argument contains glob characters
                 if '*' in arg or '?' in arg or '[' in arg:
                     # Try to expand the glob pattern
-                    matches = self._match_glob_pattern(arg)
+                    matches = self._match_glob_pattern(arg, listings)
 
                     if matches:
                         # Expand to matching files
@@ -182,18 +229,21 @@ class Shell:
 
         return expanded_commands
 
-    def _match_glob_pattern(self, pattern: str):
+    def _match_glob_pattern(self, pattern: str, listings: Optional[dict] = None):
         """
         Match a glob pattern against files in the filesystem
 
         Args:
             pattern: Glob pattern (e.g., "*.txt", "/local/*.log")
+            listings: Directory listings already fetched, by path; updated
+                with any listing this call fetches
 
         Returns:
             List of matching file paths
         """
         import fnmatch
         import os
+        import re
 
         # Resolve the pattern to absolute path
         if pattern.startswith('/'):
@@ -209,18 +259,21 @@ class Shell:
 
         try:
             # List files in the directory
-            entries = self.filesystem.list_directory(dir_path)
-
+            if listings is not None and dir_path in listings:
+                entries = listings[dir_path]
+            else:
+                entries = self.filesystem.list_directory(dir_path)
+                if listings is not None:
+                    listings[dir_path] = entries
+
+            # Translate the pattern to a regex once rather than going through
+            # fnmatch's per-call normalization and cache lookup per entry
+            match = re.compile(fnmatch.translate(file_pattern)).match
+            base = '/' if dir_path == '/' else dir_path + '/'
             for entry in entries:
-                # Match against pattern
-                if fnmatch.fnmatch(entry['name'], file_pattern):
-                    # Build full path
-                    if dir_path == '/':
-                        full_path = '/' + entry['name']
-                    else:
-                        full_path = dir_path + '/' + entry['name']
-
-                    matches.append(full_path)
+                name = entry['name']
+                if match(name):
+                    matches.append(base + name)
         except Exception as e:
             # Directory doesn't exist or other error
             # Return empty list to keep original pattern
@@ -702,9 +755,9 @@ class Shell:
             except Exception as e:
                 error_msg = str(e)
                 if "No such file or directory" in error_msg or "not found" in error_msg.lower():
-                    self.console.print(f"[red]cd: {target}: No such file or directory[/red]", highlight=False)
+                    self._error(f"cd: {target}: No such file or directory")
                 else:
-                    self.console.print(f"[red]cd: {target}: {error_msg}[/red]", highlight=False)
+                    self._error(f"cd: {target}: {error_msg}")
                 return 1
 
         # Resolve paths in redirections
@@ -715,10 +768,10 @@ class Shell:
                 stdin_data = self.filesystem.read_file(input_file)
             except AGFSClientError as e:
                 error_msg = self.filesystem.get_error_message(e)
-                self.console.print(f"[red]shell: {error_msg}[/red]", highlight=False)
+                self._error(f"shell: {error_msg}")
                 return 1
             except Exception as e:
-                self.console.print(f"[red]shell: {input_file}: {str(e)}[/red]", highlight=False)
+                self._error(f"shell: {input_file}: {str(e)}")
                 return 1
 
         # Build processes for each command
@@ -785,14 +838,16 @@ class Shell:
 
             try:
                 # Streaming write: read chunks and write each one separately
-                # This enables true streaming (each chunk sent immediately to server)
-                chunk_size = 8192  # 8KB chunks
+                # This enables true streaming (each chunk sent immediately to server).
+                # Each chunk is whatever input is already waiting, up to
+                # STREAM_CHUNK_SIZE, so bursts share one request and memory
+                # stays bounded
                 total_bytes = 0
                 is_first_chunk = True
                 write_response = None
 
                 while True:
-                    chunk = sys.stdin.buffer.read(chunk_size)
+                    chunk = _read_available(sys.stdin.buffer, STREAM_CHUNK_SIZE)
                     if not chunk:
                         break
 
@@ -813,10 +868,10 @@ class Shell:
                 stderr_data = b''
             except AGFSClientError as e:
                 error_msg = self.filesystem.get_error_message(e)
-                self.console.print(f"[red]shell: {error_msg}[/red]", highlight=False)
+                self._error(f"shell: {error_msg}")
                 return 1
             except Exception as e:
-                self.console.print(f"[red]shell: {output_file}: {str(e)}[/red]", highlight=False)
+                self._error(f"shell: {output_file}: {str(e)}")
                 return 1
         else:
             # Normal execution path
@@ -840,10 +895,10 @@ class Shell:
                         self.console.print(write_response, highlight=False)
                 except AGFSClientError as e:
                     error_msg = self.filesystem.get_error_message(e)
-                    self.console.print(f"[red]shell: {error_msg}[/red]", highlight=False)
+                    self._error(f"shell: {error_msg}")
                     return 1
                 except Exception as e:
-                    self.console.print(f"[red]shell: {output_file}: {str(e)}[/red]", highlight=False)
+                    self._error(f"shell: {output_file}: {str(e)}")
                     return 1
 
         # Output handling
@@ -855,21 +910,14 @@ class Shell:
             # Only output if we used buffered output (not direct stdout)
             # When using OutputStream.from_stdout(), data was already written directly
             if stdout_data:
-                try:
-                    # Decode and use rich console for output
-                    text = stdout_data.decode('utf-8', errors='replace')
-                    self.console.print(text, end='', highlight=False)
-                    # Ensure output ends with newline (only in interactive mode)
-                    if self.interactive and text and not text.endswith('\n'):
-                        self.console.print(highlight=False)
-                except Exception:
-                    # Fallback to raw output if decoding fails
-                    sys.stdout.buffer.write(stdout_data)
-                    sys.stdout.buffer.flush()
-                    # Ensure output ends with newline (only in interactive mode)
-                    if self.interactive and stdout_data and not stdout_data.endswith(b'\n'):
-                        sys.stdout.write('\n')
-                        sys.stdout.flush()
+                # Command output is plain bytes (with any ANSI colour the
+                # command added itself), so it is written as-is: no decode,
+                # and no Rich markup or emoji parsing of file contents
+                sys.stdout.buffer.write(stdout_data)
+                # Ensure output ends with newline (only in interactive mode)
+                if self.interactive and not stdout_data.endswith(b'\n'):
+                    sys.stdout.buffer.write(b'\n')
+                sys.stdout.buffer.flush()
             elif last_process and hasattr(last_process.stdout, 'ends_with_newline'):
                 # When using from_stdout() (direct output), check if we need newline (only in interactive mode)
                 if self.interactive and not last_process.stdout.ends_with_newline():
@@ -889,18 +937,17 @@ class Shell:
                     self.console.print(write_response, highlight=False)
             except AGFSClientError as e:
                 error_msg = self.filesystem.get_error_message(e)
-                self.console.print(f"[red]shell: {error_msg}[/red]", highlight=False)
+                self._error(f"shell: {error_msg}")
                 return 1
             except Exception as e:
-                self.console.print(f"[red]shell: {error_file}: {str(e)}[/red]", highlight=False)
+                self._error(f"shell: {error_file}: {str(e)}")
                 return 1
         else:
             # Output to stderr if no redirection
             if stderr_data:
                 try:
-                    # Decode and use rich console for stderr
                     text = stderr_data.decode('utf-8', errors='replace')
-                    self.console.print(f"[red]{text}[/red]", end='', highlight=False)
+                    self._error(text, end='')
                 except Exception:
                     # Fallback to raw output
                     sys.stderr.buffer.write(stderr_data)
@@ -908,28 +955,55 @@ class Shell:
 
         return exit_code
 
+    def _error(self, message: str, end: str = '\n'):
+        """Write an error to stderr, in red on a terminal, without going through rich"""
+        if sys.stderr.isatty():
+            message = f"\033[31m{message}\033[0m"
+        sys.stderr.write(message + end)
+        sys.stderr.flush()
+
+    def _prompt(self) -> str:
+        """Primary prompt, rebuilt only when cwd changes"""
+        if self._prompt_cwd != self.cwd:
+            self._prompt_cwd = self.cwd
+            self._prompt_text = f"agfs:{self.cwd}> "
+        return self._prompt_text
+
     def repl(self):
         """Run interactive REPL"""
         # Set interactive mode flag
         self.interactive = True
+
+        # Connect (and fetch the root listing) in the background while rich
+        # is imported and the banner rendered
+        from concurrent.futures import ThreadPoolExecutor
+        startup = ThreadPoolExecutor(max_workers=1)
+        startup_info = startup.submit(self.filesystem.startup_info)
+        startup.shutdown(wait=False)
+
+        # Each console.print parses markup and flushes, so the banner goes
+        # out in one call before connecting and one after
         self.console.print("""     __  __ __ 
  /\\ / _ |_ (_  
 /--\\\\__)|  __) 
-        """)
-        self.console.print("[bold cyan]agfs-shell[/bold cyan] v1.1.0", highlight=False)
-
-        # Check server connection - exit if failed
-        if not self.filesystem.check_connection():
-            self.console.print(f"[red]Error: Cannot connect to AGFS server at {self.server_url}[/red]", highlight=False)
-            self.console.print("Make sure the server is running.", highlight=False)
+        
+[bold cyan]agfs-shell[/bold cyan] v1.1.0""", highlight=False)
+
+        # Check server connection - exit if failed. The root listing comes
+        # back with the check and seeds tab completion
+        root_listing = startup_info.result()
+        if root_listing is None:
+            self.console.print(f"[red]Error: Cannot connect to AGFS server at {self.server_url}[/red]\n"
+                               "Make sure the server is running.", highlight=False)
             sys.exit(1)
 
-        self.console.print(f"Connected to AGFS server at [green]{self.server_url}[/green]", highlight=False)
-        self.console.print("Type [cyan]'help'[/cyan] for help, [cyan]Ctrl+D[/cyan] or [cyan]'exit'[/cyan] to quit", highlight=False)
-        self.console.print(highlight=False)
+        self.console.print(f"Connected to AGFS server at [green]{self.server_url}[/green]\n"
+                           "Type [cyan]'help'[/cyan] for help, [cyan]Ctrl+D[/cyan] or [cyan]'exit'[/cyan] to quit\n",
+                           highlight=False)
 
         # Setup tab completion and history
         history_loaded = False
+        loaded_history = None  # (file, entries) read at startup
         try:
             import readline
             import os
@@ -938,7 +1012,9 @@ class Shell:
             completer = ShellCompleter(self.filesystem)
             # Pass shell reference to completer for cwd
             completer.shell = self
+            completer.seed('/', root_listing)
             readline.set_completer(completer.complete)
+            self.completer = completer
 
             # Set up completion display hook for better formatting
             try:
@@ -967,8 +1043,7 @@ class Shell:
                         print()
 
                     # Re-display prompt
-                    prompt = f"agfs:{self.cwd}> "
-                    print(prompt + readline.get_line_buffer(), end='', flush=True)
+                    print(self._prompt() + readline.get_line_buffer(), end='', flush=True)
 
                 readline.set_completion_display_matches_hook(display_matches)
             except AttributeError:
@@ -1005,6 +1080,8 @@ class Shell:
             try:
                 readline.read_history_file(history_file)
                 history_loaded = True
+                # Remember what was loaded so exit only appends this session's lines
+                loaded_history = (history_file, readline.get_current_history_length())
             except FileNotFoundError:
                 # History file doesn't exist yet - will be created on exit
                 pass
@@ -1016,13 +1093,20 @@ class Shell:
             # readline not available (e.g., on Windows without pyreadline)
             pass
 
+        command = ''
         while self.running:
+            # One handler per iteration: Ctrl+C must still raise
+            # KeyboardInterrupt so it can stop a running command
             try:
+                # The previous command may have changed the filesystem
+                if self.completer is not None:
+                    self.completer.invalidate_after(command)
+                    self.completer.prefetch(self.cwd)
+
                 # Read command (possibly multiline)
                 try:
                     # Primary prompt
-                    prompt = f"agfs:{self.cwd}> "
-                    line = input(prompt)
+                    line = input(self._prompt())
 
                     # Start building the command
                     self.multiline_buffer = [line]
@@ -1185,7 +1269,7 @@ class Shell:
                     self.console.print("\n^C", highlight=False)
                     continue
                 except Exception as e:
-                    self.console.print(f"[red]Error: {e}[/red]", highlight=False)
+                    self._error(f"Error: {e}")
 
             except KeyboardInterrupt:
                 # Ctrl+C at top level - start new line
@@ -1200,7 +1284,13 @@ class Shell:
                 import readline
                 import os
                 history_file = os.path.expanduser(self.env['HISTFILE'])
-                readline.write_history_file(history_file)
+                total = readline.get_current_history_length()
+                if (loaded_history is not None and loaded_history[0] == history_file
+                        and total <= 1000 and hasattr(readline, 'append_history_file')):
+                    # Append just the new lines instead of rewriting the file
+                    readline.append_history_file(total - loaded_history[1], history_file)
+                else:
+                    readline.write_history_file(history_file)
             except Exception as e:
                 self.console.print(f"[yellow]Warning: Could not save history: {e}[/yellow]", highlight=False)
 
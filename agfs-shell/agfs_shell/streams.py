@@ -131,13 +131,14 @@ class OutputStream(Stream):
 
     def write(self, data: Union[bytes, str]) -> int:
         """Write to stream and track last character"""
+        # Encode once here; the base class and the tracking below then both
+        # see bytes, rather than each encoding the text again
+        if isinstance(data, str):
+            data = data.encode('utf-8')
         result = super().write(data)
         # Track last character for newline checking
         if data:
-            if isinstance(data, str):
-                data = data.encode('utf-8')
-            if len(data) > 0:
-                self._last_char = data[-1:]
+            self._last_char = data[-1:]
         return result
 
     def ends_with_newline(self) -> bool:
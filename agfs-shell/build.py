@@ -6,16 +6,48 @@ Requires Python 3.8+ on target system, but includes all dependencies
 """
 import os
 import sys
+import argparse
+import ast
+import compileall
+import csv
+import functools
+import hashlib
+import py_compile
+import tempfile
+import zipfile
 import subprocess
 import shutil
+import sysconfig
+import tarfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+# Number of independent install steps run at once (AGFS_BUILD_JOBS=1 runs them serially)
+BUILD_JOBS = int(os.environ.get("AGFS_BUILD_JOBS", "4"))
+
+# Resolved third-party dependencies are cached here between builds (AGFS_BUILD_CACHE=off disables)
+BUILD_CACHE = os.environ.get("AGFS_BUILD_CACHE", str(Path.home() / ".cache" / "agfs-build"))
+
+# Top-level lib/ entries built from this repo; everything else in lib/ is a
+# cacheable dependency, apart from the scripts these install into lib/bin
+LOCAL_PACKAGES = ("pyagfs", "agfs_shell")
+
+@functools.lru_cache(maxsize=None)
 def get_git_hash():
-    """Get current git commit hash"""
+    """Get current git commit hash (looked up once per build), in-process with dulwich if available"""
+    repo_dir = Path(__file__).parent.absolute()
+    try:
+        from dulwich.repo import Repo
+        with Repo.discover(str(repo_dir)) as repo:
+            return repo.head().decode("ascii")[:7]
+    except Exception:
+        # dulwich not installed or not a git checkout - ask git itself
+        pass
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(repo_dir),
             capture_output=True,
             text=True,
             check=True
@@ -24,8 +56,44 @@ def get_git_hash():
     except:
         return "unknown"
 
+def patch_version(version_file, updates):
+    """Rewrite build info assignments in version_file in a single open.
+
+    updates maps a name such as "__git_hash__" to its new string value, or
+    to None to remove the assignment. Names not yet present are inserted
+    after the __version__ line. The file is only written if it changed.
+    Returns the original content.
+    """
+    with open(version_file, 'r+') as f:
+        content = f.read()
+        lines = content.split('\n')
+        new_lines = []
+        missing = [name for name, value in updates.items() if value is not None]
+        version_index = None
+        for line in lines:
+            name = line.split(' = ', 1)[0]
+            if name in updates:
+                if updates[name] is not None:
+                    new_lines.append(f'{name} = "{updates[name]}"')
+                    missing.remove(name)
+                continue
+            new_lines.append(line)
+            if line.startswith('__version__'):
+                version_index = len(new_lines)
+        if missing:
+            if version_index is None:
+                version_index = len(new_lines)
+            new_lines[version_index:version_index] = [f'{name} = "{updates[name]}"' for name in missing]
+
+        new_content = '\n'.join(new_lines)
+        if new_content != content:
+            f.seek(0)
+            f.write(new_content)
+            f.truncate()
+        return content
+
 def inject_version_info(script_dir):
-    """Inject git hash and build date into __init__.py"""
+    """Inject git hash and build date into __init__.py, returning its original content"""
     try:
         version_file = script_dir / "agfs_shell" / "__init__.py"
 
@@ -36,38 +104,16 @@ def inject_version_info(script_dir):
         git_hash = get_git_hash()
         build_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # Read current version file
-        with open(version_file, 'r') as f:
-            content = f.read()
-
-        # Add build info if not present
-        if '__git_hash__' not in content:
-            # Find the version line and add build info after it
-            lines = content.split('\n')
-            new_lines = []
-            for line in lines:
-                new_lines.append(line)
-                if line.startswith('__version__'):
-                    new_lines.append(f'__git_hash__ = "{git_hash}"')
-                    new_lines.append(f'__build_date__ = "{build_date}"')
-            content = '\n'.join(new_lines)
-        else:
-            # Replace placeholders
-            import re
-            content = re.sub(r'__git_hash__ = ".*?"', f'__git_hash__ = "{git_hash}"', content)
-            content = re.sub(r'__build_date__ = ".*?"', f'__build_date__ = "{build_date}"', content)
-
-        # Write back
-        with open(version_file, 'w') as f:
-            f.write(content)
+        original = patch_version(version_file, {"__git_hash__": git_hash, "__build_date__": build_date})
 
         print(f"Injected version info: git={git_hash}, date={build_date}")
+        return original
     except Exception as e:
         print(f"Error injecting version info: {e}")
         raise
 
-def restore_version_file(script_dir):
-    """Restore __init__.py to dev state"""
+def restore_version_file(script_dir, original=None):
+    """Restore __init__.py to dev state, from the snapshot taken by inject_version_info if given"""
     try:
         version_file = script_dir / "agfs_shell" / "__init__.py"
 
@@ -75,27 +121,227 @@ def restore_version_file(script_dir):
             print(f"Warning: Version file not found at {version_file}")
             return
 
-        with open(version_file, 'r') as f:
-            content = f.read()
-
-        # Remove build info lines or restore to dev placeholders
-        lines = content.split('\n')
-        new_lines = []
-        for line in lines:
-            if '__git_hash__' in line or '__build_date__' in line:
-                continue
-            new_lines.append(line)
-
-        with open(version_file, 'w') as f:
-            f.write('\n'.join(new_lines))
+        if original is not None:
+            # Put back the exact content we replaced - one write, no parsing
+            with open(version_file, 'w') as f:
+                f.write(original)
+        else:
+            # Remove build info lines
+            patch_version(version_file, {"__git_hash__": None, "__build_date__": None})
 
         print("Restored version file to dev state")
     except Exception as e:
         print(f"Warning: Failed to restore version file: {e}")
         # Don't raise here - we don't want to fail the build if restore fails
 
+def uv_install(uv_path, script_dir, lib_dir, *args):
+    """Install packages into lib_dir with uv, showing uv's output only on failure"""
+    # An absolute executable, close_fds=False and no cwd= let subprocess
+    # launch uv with posix_spawn instead of fork+exec; uv's --directory
+    # stands in for cwd. Our pipes are close-on-exec, so nothing leaks.
+    result = subprocess.run([
+        uv_path, "--directory", str(script_dir),
+        "pip", "install",
+        "--target", str(lib_dir),
+        "--python", sys.executable,
+        *args
+    ], capture_output=True, text=True, close_fds=False)
+    if result.returncode != 0:
+        sys.stderr.write(result.stdout + result.stderr)
+        raise subprocess.CalledProcessError(result.returncode, result.args)
+
+def run_parallel(steps, max_workers):
+    """Run independent (func, *args) build steps concurrently, re-raising the first failure"""
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(func, *args) for func, *args in steps]
+        for future in as_completed(futures):
+            future.result()
+
+def run_in_order(*steps):
+    """Run (func, *args) build steps one after another, e.g. as one run_parallel step"""
+    for func, *args in steps:
+        func(*args)
+
+def deps_fingerprint(script_dir, dependencies):
+    """Hash everything that determines the resolved third-party dependency set"""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in ("pyproject.toml", "uv.lock"):
+        path = script_dir / name
+        if path.exists():
+            digest.update(path.read_bytes())
+    digest.update(repr((sys.version_info[:2], sysconfig.get_platform(), dependencies)).encode())
+    return digest.hexdigest()
+
+def is_local_package(name):
+    """Whether a top-level lib/ entry comes from this repo rather than a dependency"""
+    return name.split("-")[0] in LOCAL_PACKAGES
+
+# tarfile compression for each dependency archive suffix
+ARCHIVE_COMPRESSION = {".tar": "", ".gz": "gz", ".tgz": "gz", ".xz": "xz", ".bz2": "bz2"}
+
+def archive_compression(archive):
+    """The tarfile compression for an archive path, rejecting suffixes tarfile can't write"""
+    try:
+        return ARCHIVE_COMPRESSION[archive.suffix]
+    except KeyError:
+        raise ValueError(f"unsupported archive type: {archive.name} "
+                         "(use .tar, .tar.gz, .tgz, .tar.xz or .tar.bz2)") from None
+
+def local_scripts(lib_dir):
+    """Archive names of the lib/bin scripts installed by this repo's packages, from their RECORD"""
+    scripts = set()
+    for record in lib_dir.glob("*.dist-info/RECORD"):
+        if not is_local_package(record.parent.name):
+            continue
+        with open(record, newline="") as f:
+            for row in csv.reader(f):
+                path = row[0].replace(os.sep, "/") if row else ""
+                if path.startswith("bin/") or "/bin/" in path:
+                    scripts.add("bin/" + path.rsplit("/", 1)[1])
+    return scripts
+
+def save_deps_cache(lib_dir, archive):
+    """Archive the third-party packages in lib_dir, and the scripts they put in
+    lib/bin, for reuse by later builds"""
+    # Compression follows the archive name: .tar.gz, .tar.xz, .tar.bz2 or plain .tar
+    compression = archive_compression(archive)
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    skip = local_scripts(lib_dir)
+    tmp_archive = archive.with_suffix(".tmp")
+    with tarfile.open(tmp_archive, f"w:{compression}") as tar:
+        for entry in sorted(lib_dir.iterdir()):
+            if not is_local_package(entry.name):
+                tar.add(entry, arcname=entry.name,
+                        filter=lambda info: None if info.name in skip else info)
+    os.replace(tmp_archive, archive)
+
+def restore_deps_cache(archive, lib_dir):
+    """Unpack cached third-party packages into lib_dir"""
+    with tarfile.open(archive, "r:*") as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(lib_dir, filter="data")
+        else:
+            tar.extractall(lib_dir)
+
+def parallel_copytree(src, dst, workers=8):
+    """Copy a directory tree like shutil.copytree, copying files on a thread pool
+
+    Directories are created up front in one walk; the per-file copies are
+    independent and shutil.copy2 already copies data in-kernel (sendfile)
+    on Linux, so overlapping them removes most of the per-file latency.
+    """
+    pairs = []
+    stack = [(Path(src), Path(dst))]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        dst_dir.mkdir(parents=True)
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                target = dst_dir / entry.name
+                if entry.is_dir():
+                    stack.append((Path(entry.path), target))
+                else:
+                    pairs.append((entry.path, target))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(lambda pair: shutil.copy2(*pair), pairs):
+            pass
+    return dst
+
+# Files that may appear in a package without keeping it out of lib.zip
+ZIPPABLE_SUFFIXES = (".py", ".pyi", ".typed")
+
+def is_zippable(path):
+    """Whether a lib/ entry is pure Python and can be imported from a zip"""
+    if path.is_file():
+        return path.suffix == ".py"
+    if path.name.endswith((".dist-info", ".egg-info", ".data")) or path.name == "bin":
+        return False
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]
+        if any(not name.endswith(ZIPPABLE_SUFFIXES) for name in filenames):
+            return False
+    return True
+
+def bundle_pure_packages(lib_dir, zip_path):
+    """Move pure-Python packages from lib_dir into a single zip on sys.path
+
+    Importing from one zip replaces a stat/open per module with lookups in
+    the zip's in-memory index. Packages with extension modules or data files
+    stay in lib_dir, since zipimport can't load them. Sources are stored
+    next to unchecked-hash .pyc files, so the zip works without write access
+    and still falls back to source on a different Python version.
+    """
+    entries = sorted(entry for entry in lib_dir.iterdir() if is_zippable(entry))
+    with tempfile.TemporaryDirectory() as tmp_dir, \
+            zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        pyc_path = os.path.join(tmp_dir, "module.pyc")
+        for entry in entries:
+            files = [entry] if entry.is_file() else sorted(
+                p for p in entry.rglob("*") if p.is_file() and "__pycache__" not in p.parts)
+            for file in files:
+                arcname = file.relative_to(lib_dir).as_posix()
+                zf.write(file, arcname)
+                if file.suffix == ".py":
+                    py_compile.compile(str(file), cfile=pyc_path, dfile=arcname, doraise=True,
+                                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+                    zf.write(pyc_path, arcname[:-3] + ".pyc")
+    for entry in entries:
+        if entry.is_dir():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+    return len(entries)
+
+# Directories inside installed packages that are never needed at runtime
+PRUNE_DIRS = {"tests", "test", "__pycache__"}
+
+def prune_lib(lib_dir):
+    """Remove bundled test suites, stale bytecode and type stubs from lib_dir"""
+    removed = 0
+    for package in lib_dir.iterdir():
+        if not package.is_dir() or package.name.endswith((".dist-info", ".egg-info")):
+            continue
+        for dirpath, dirnames, filenames in os.walk(package):
+            for name in [d for d in dirnames if d in PRUNE_DIRS]:
+                shutil.rmtree(os.path.join(dirpath, name))
+                dirnames.remove(name)
+                removed += 1
+            for name in filenames:
+                if name.endswith(".pyi"):
+                    os.unlink(os.path.join(dirpath, name))
+                    removed += 1
+    return removed
+
+def tree_size(root):
+    """Total size of regular files under root, from a single scandir pass per directory"""
+    total = 0
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Build portable agfs-shell distribution")
+    parser.add_argument("--from-archive", type=Path, metavar="PATH",
+                        help="unpack third-party dependencies from a prebuilt archive instead of running uv")
+    parser.add_argument("--to-archive", type=Path, metavar="PATH",
+                        help="after building, write the third-party dependencies to an archive for --from-archive")
+    parser.add_argument("--zip", action="store_true",
+                        help="bundle pure-Python packages into lib.zip to cut per-module file lookups at startup")
+    args = parser.parse_args()
+    if args.to_archive is not None:
+        # Checked now rather than after the whole build has run
+        try:
+            archive_compression(args.to_archive)
+        except ValueError as e:
+            parser.error(str(e))
+
     # Get the directory containing this script
     script_dir = Path(__file__).parent.absolute()
     dist_dir = script_dir / "dist"
@@ -108,56 +354,88 @@ def main():
         shutil.rmtree(portable_dir)
     portable_dir.mkdir(parents=True, exist_ok=True)
 
+    original_version = None
     try:
         # Check if uv is available
-        has_uv = shutil.which("uv") is not None
+        uv_path = shutil.which("uv")
 
-        if not has_uv:
+        if uv_path is None:
             print("Error: uv is required for building")
             print("Install uv: curl -LsSf https://astral.sh/uv/install.sh | sh")
             sys.exit(1)
 
         # Inject version information (after all prerequisite checks)
-        inject_version_info(script_dir)
+        original_version = inject_version_info(script_dir)
 
         print("Installing dependencies to portable directory...")
         # Install dependencies directly to a lib directory (no venv)
         lib_dir = portable_dir / "lib"
+        lib_dir.mkdir(parents=True, exist_ok=True)
 
-        # First copy pyagfs SDK source directly (bypass uv's editable mode)
+        # Copying pyagfs and restoring the dependency cache run alongside
+        # the uv installs to overlap their network and disk waits. The uv
+        # installs themselves run one after the other: both write into
+        # lib_dir/bin and their own metadata, so they must not race
+        steps = []
+        installs = []
+
+        # Copy pyagfs SDK source directly (bypass uv's editable mode)
         pyagfs_src_dir = script_dir.parent / "agfs-sdk" / "python" / "pyagfs"
         if pyagfs_src_dir.exists():
             print(f"Copying local pyagfs from {pyagfs_src_dir}...")
             pyagfs_dest_dir = lib_dir / "pyagfs"
-            shutil.copytree(pyagfs_src_dir, pyagfs_dest_dir)
-
-            # Also install pyagfs dependencies
-            subprocess.check_call([
-                "uv", "pip", "install",
-                "--target", str(lib_dir),
-                "--python", sys.executable,
-                "requests>=2.31.0"  # Install pyagfs's dependencies with their transitive deps
-            ], cwd=str(script_dir))
+            steps.append((parallel_copytree, pyagfs_src_dir, pyagfs_dest_dir))
         else:
             print(f"Warning: pyagfs SDK not found at {pyagfs_src_dir}")
 
-        # Then install agfs-shell and remaining dependencies
-        subprocess.check_call([
-            "uv", "pip", "install",
-            "--target", str(lib_dir),
-            "--python", sys.executable,
-            "--no-deps",  # Don't install dependencies, we'll do it separately
-            str(script_dir)
-        ], cwd=str(script_dir))
-
-        # Install all agfs-shell dependencies from pyproject.toml (excluding pyagfs which we already copied)
-        subprocess.check_call([
-            "uv", "pip", "install",
-            "--target", str(lib_dir),
-            "--python", sys.executable,
-            "rich",
-            "jq"
-        ], cwd=str(script_dir))
+        # Install agfs-shell itself; its dependencies are installed separately
+        installs.append((uv_install, uv_path, script_dir, lib_dir, "--no-deps", str(script_dir)))
+
+        # Third-party dependencies: pyagfs's (with their transitive deps) and
+        # agfs-shell's from pyproject.toml (excluding pyagfs which we already
+        # copied). One uv run resolves and downloads them all in parallel.
+        dependencies = ("rich", "jq")
+        if pyagfs_src_dir.exists():
+            dependencies = ("requests>=2.31.0",) + dependencies
+
+        deps_archive = None
+        if args.from_archive is not None:
+            deps_archive = args.from_archive.absolute()
+            if not deps_archive.exists():
+                print(f"Error: dependency archive not found: {deps_archive}")
+                sys.exit(1)
+        elif BUILD_CACHE != "off":
+            fingerprint = deps_fingerprint(script_dir, dependencies)
+            deps_archive = Path(BUILD_CACHE) / f"deps-{fingerprint}.tar.gz"
+
+        if deps_archive is not None and deps_archive.exists():
+            print(f"Using prebuilt dependencies from {deps_archive}")
+            steps.append((restore_deps_cache, deps_archive, lib_dir))
+        else:
+            installs.append((uv_install, uv_path, script_dir, lib_dir, *dependencies))
+
+        steps.append((run_in_order, *installs))
+        run_parallel(steps, BUILD_JOBS)
+
+        pruned = prune_lib(lib_dir)
+        print(f"Pruned {pruned} test directories and stub files from lib")
+
+        if deps_archive is not None and not deps_archive.exists():
+            save_deps_cache(lib_dir, deps_archive)
+            print(f"Cached dependencies to {deps_archive}")
+
+        if args.to_archive is not None:
+            save_deps_cache(lib_dir, args.to_archive.absolute())
+            print(f"Wrote dependency archive to {args.to_archive}")
+
+        if args.zip:
+            bundled = bundle_pure_packages(lib_dir, portable_dir / "lib.zip")
+            print(f"Bundled {bundled} pure-Python packages into lib.zip")
+
+        # Precompile what is left on disk so the first run doesn't compile
+        # every imported module; sources are kept for tracebacks
+        print("Compiling bytecode...")
+        compileall.compile_dir(str(lib_dir), quiet=1, workers=0)
 
         # Create launcher script
         print("Creating launcher scripts...")
@@ -178,6 +456,11 @@ script_dir = os.path.dirname(script_path)
 lib_dir = os.path.join(script_dir, 'lib')
 sys.path.insert(0, lib_dir)
 
+# Pure-Python packages bundled by "build.py --zip"
+lib_zip = os.path.join(script_dir, 'lib.zip')
+if os.path.exists(lib_zip):
+    sys.path.insert(1, lib_zip)
+
 # Run the CLI
 from agfs_shell.cli import main
 
@@ -229,7 +512,7 @@ Example:
 """)
 
         # Calculate size
-        total_size = sum(f.stat().st_size for f in portable_dir.rglob('*') if f.is_file())
+        total_size = tree_size(portable_dir)
 
         print(f"\nBuild successful!")
         print(f"Portable directory: {portable_dir}")
@@ -240,16 +523,21 @@ Example:
 
     finally:
         # Always restore version file to dev state
-        restore_version_file(script_dir)
+        restore_version_file(script_dir, original_version)
 
+@functools.lru_cache(maxsize=None)
 def get_version_string():
     """Get version string for README"""
     try:
-        # Read from __init__.py
+        # Read the __*__ string assignments from __init__.py without executing it
         version_file = Path(__file__).parent / "agfs_shell" / "__init__.py"
         namespace = {}
-        with open(version_file) as f:
-            exec(f.read(), namespace)
+        tree = ast.parse(version_file.read_text())
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+                name = node.targets[0].id
+                if name in ('__version__', '__git_hash__', '__build_date__'):
+                    namespace[name] = ast.literal_eval(node.value)
 
         version = namespace.get('__version__', '0.1.0')
         git_hash = namespace.get('__git_hash__', 'dev')
@@ -1,10 +1,102 @@
-import unittest
-import tempfile
+import io
 import os
-from agfs_shell.builtins import BUILTINS
+import tempfile
+import unittest
+from unittest import mock
+from pyagfs import AGFSClientError, AGFSHTTPError
+from agfs_shell.builtins import BULK_MIN_FILES, BUILTINS
 from agfs_shell.process import Process
 from agfs_shell.streams import InputStream, OutputStream, ErrorStream
 
+
+class FakeResponse:
+    """Streamed response from FakeClient: a raw body and iter_content chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.raw = io.BytesIO(b"".join(chunks))
+
+    def iter_content(self, chunk_size=None):
+        return iter(self.chunks)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeClient:
+    """The AGFSClient calls builtins make directly, against a FakeFileSystem"""
+
+    def __init__(self, fs):
+        self.fs = fs
+        # Raised by the bulk endpoints; by default the server has none
+        self.bulk_error = AGFSHTTPError("Server has no bulk endpoint", 404)
+        # Tar archive served by bulk_download instead of bulk_error
+        self.archive = None
+        # Chunks served by cat(stream=True); None if the file can't stream
+        self.stream = None
+        # Served by mounts(): the plugin mounted at each path
+        self.mount_table = [{'path': '/', 'pluginName': 'memfs'}]
+
+    def mkdir(self, path):
+        self.fs.dirs.setdefault(path, [])
+
+    def bulk_upload(self, path, chunks):
+        raise self.bulk_error
+
+    def bulk_download(self, path):
+        if self.archive is None:
+            raise self.bulk_error
+        return FakeResponse([self.archive])
+
+    def mounts(self):
+        return self.mount_table
+
+    def cat(self, path, stream=False):
+        if self.stream is None:
+            raise AGFSClientError("streaming not supported")
+        return FakeResponse(self.stream)
+
+
+class FakeFileSystem:
+    """In-memory AGFSFileSystem: dirs maps paths to listings, files to contents"""
+
+    def __init__(self, dirs=None, files=None):
+        self.dirs = dirs if dirs is not None else {}
+        self.files = files if files is not None else {}
+        self.reads = []  # (offset, size) of each read_file call
+        self.client = FakeClient(self)
+
+    def get_file_info(self, path):
+        if path in self.dirs:
+            return {'isDir': True}
+        if path in self.files:
+            return {'isDir': False, 'size': len(self.files[path])}
+        raise AGFSClientError("No such file or directory")
+
+    def list_directory(self, path):
+        if path not in self.dirs:
+            raise AGFSClientError("No such file or directory")
+        return self.dirs[path]
+
+    def read_file(self, path, offset=0, size=-1, stream=False):
+        self.reads.append((offset, size))
+        if path not in self.files:
+            raise AGFSClientError("No such file or directory")
+        data = self.files[path][offset:]
+        if size >= 0:
+            data = data[:size]
+        return iter([data]) if stream else data
+
+    def write_file(self, path, data, append=False):
+        self.files[path] = data
+
+
 class TestBuiltins(unittest.TestCase):
     def create_process(self, command, args, input_data=""):
         stdin = InputStream.from_string(input_data)
@@ -107,6 +199,221 @@ class TestBuiltins(unittest.TestCase):
         self.assertEqual(output[0], "line10")
         self.assertEqual(output[-1], "line19")
 
+    def test_tail_file(self):
+        cmd = BUILTINS['tail']
+        fs = FakeFileSystem(files={'/log.txt': b"".join(b"line%d\n" % i for i in range(5000))})
+
+        proc = self.create_process("tail", ["-n", "2", "/log.txt"])
+        proc.filesystem = fs
+        self.assertEqual(cmd(proc), 0)
+        self.assertEqual(proc.get_stdout(), b"line4998\nline4999\n")
+        # Only the end of the file is fetched
+        self.assertEqual(len(fs.reads), 1)
+        self.assertGreater(fs.reads[0][0], 0)
+
+    def test_tail_file_unknown_size(self):
+        cmd = BUILTINS['tail']
+        fs = FakeFileSystem(files={'/proc.txt': b"a\nb\nc\n"})
+
+        # A synthetic file reports no size, so it is read whole - just once
+        proc = self.create_process("tail", ["-n", "2", "/proc.txt"])
+        proc.filesystem = fs
+        with mock.patch.object(fs, 'get_file_info', return_value={'isDir': False, 'size': 0}):
+            self.assertEqual(cmd(proc), 0)
+        self.assertEqual(proc.get_stdout(), b"b\nc\n")
+        self.assertEqual(fs.reads, [(0, -1)])
+
+    def test_tail_follow_stream(self):
+        cmd = BUILTINS['tail']
+        fs = FakeFileSystem(files={'/streams/log': b""})
+        fs.client.mount_table.append({'path': '/streams', 'pluginName': 'streamfs'})
+        fs.client.stream = [b"one\n", b"", b"two\n"]
+
+        # streamfs pushes each write, so nothing is read or polled
+        proc = self.create_process("tail", ["-f", "/streams/log"])
+        proc.filesystem = fs
+        self.assertEqual(cmd(proc), 0)
+        self.assertEqual(proc.get_stdout(), b"one\ntwo\n")
+        self.assertEqual(fs.reads, [])
+
+    def test_tail_follow_polls(self):
+        cmd = BUILTINS['tail']
+        fs = FakeFileSystem(files={'/log.txt': b"zero\none\n"})
+        # Like localfs, the stream would just read the file to EOF; it's unused
+        fs.client.stream = [b"zero\none\n"]
+
+        # Each poll first changes the file: an append, then a truncation,
+        # then the user interrupts
+        changes = [
+            lambda: fs.files.update({'/log.txt': b"zero\none\ntwo\n"}),
+            lambda: fs.files.update({'/log.txt': b"x\n"}),
+        ]
+
+        def sleep(seconds):
+            if not changes:
+                raise KeyboardInterrupt
+            changes.pop(0)()
+
+        proc = self.create_process("tail", ["-f", "-n", "1", "/log.txt"])
+        proc.filesystem = fs
+        with mock.patch('time.sleep', sleep):
+            self.assertEqual(cmd(proc), 130)
+        self.assertEqual(proc.get_stdout(), b"one\ntwo\nx\n")
+        self.assertIn(b"file truncated", proc.get_stderr())
+
+    def test_tree_deep(self):
+        cmd = BUILTINS['tree']
+        depth = 2000
+        fs = FakeFileSystem()
+        path = '/'
+        for _ in range(depth):
+            fs.dirs[path] = [{'name': 'd', 'isDir': True}]
+            path = path.rstrip('/') + '/d'
+        fs.dirs[path] = [{'name': 'leaf.txt'}]
+
+        # Deeper than the recursion limit
+        proc = self.create_process("tree", ["/"])
+        proc.filesystem = fs
+        self.assertEqual(cmd(proc), 0)
+        output = proc.get_stdout().decode('utf-8')
+        self.assertIn(f"{depth} directories, 1 files", output)
+        self.assertIn("└── leaf.txt", output)
+
+    def test_tree_max_entries(self):
+        cmd = BUILTINS['tree']
+        fs = FakeFileSystem(dirs={
+            '/': [{'name': f'f{i}'} for i in range(5)] + [{'name': 'sub', 'isDir': True}],
+            '/sub': [{'name': 'x.txt'}],
+        })
+
+        proc = self.create_process("tree", ["--max-entries", "2", "/"])
+        proc.filesystem = fs
+        self.assertEqual(cmd(proc), 0)
+        output = proc.get_stdout().decode('utf-8')
+        self.assertIn("├── f0\n└── ... 4 more entries\n", output)
+        self.assertNotIn("f1", output)
+        self.assertIn("1 directories, 6 files", output)
+
+    def test_tree_interrupt_cancels_queued_listings(self):
+        import threading
+        cmd = BUILTINS['tree']
+        fs = FakeFileSystem(dirs={'/': [{'name': f'd{i}', 'isDir': True} for i in range(50)]})
+        release = threading.Event()
+        listed = []
+
+        def list_directory(path):
+            if path == '/':
+                return fs.dirs[path]
+            listed.append(path)
+            if path == '/d0':
+                # The user presses Ctrl+C while the first subdirectory loads
+                raise KeyboardInterrupt
+            release.wait(5)
+            return []
+
+        proc = self.create_process("tree", ["/"])
+        proc.filesystem = fs
+        with mock.patch.object(fs, 'list_directory', list_directory):
+            with self.assertRaises(KeyboardInterrupt):
+                cmd(proc)
+            release.set()
+        # Only listings already being fetched ran; the queued rest were dropped
+        self.assertLess(len(listed), 50)
+
+    def test_upload_parallel(self):
+        cmd = BUILTINS['upload']
+        fs = FakeFileSystem()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3):
+                with open(os.path.join(tmp, f'f{i}.txt'), 'wb') as f:
+                    f.write(b'x' * i)
+            proc = self.create_process("upload", ["-r", "--parallel", "2", tmp, "/dst"])
+            proc.filesystem = fs
+            proc.cwd = '/'
+            self.assertEqual(cmd(proc), 0)
+        self.assertEqual(fs.files, {'/dst/f0.txt': b'', '/dst/f1.txt': b'x', '/dst/f2.txt': b'xx'})
+
+        proc = self.create_process("upload", ["--parallel", "0", "a", "/dst"])
+        self.assertEqual(cmd(proc), 1)
+
+    def test_bulk_upload_fallback(self):
+        cmd = BUILTINS['upload']
+        fs = FakeFileSystem(dirs={'/dst': []})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(BULK_MIN_FILES):
+                with open(os.path.join(tmp, f'f{i}.txt'), 'wb') as f:
+                    f.write(b'x')
+
+            # Only a server without the endpoint falls back to per-file uploads
+            proc = self.create_process("upload", ["-r", tmp, "/dst"])
+            proc.filesystem = fs
+            self.assertEqual(cmd(proc), 0)
+            self.assertEqual(len(fs.files), BULK_MIN_FILES)
+
+            fs.files.clear()
+            fs.client.bulk_error = AGFSClientError("Permission denied")
+            proc = self.create_process("upload", ["-r", tmp, "/dst"])
+            proc.filesystem = fs
+            self.assertEqual(cmd(proc), 1)
+            self.assertIn(b"Permission denied", proc.get_stderr())
+            self.assertEqual(fs.files, {})
+
+    def test_bulk_download(self):
+        import tarfile
+        cmd = BUILTINS['download']
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar:
+            for name, data in (('sub/a.txt', b'hello'), ('../evil.txt', b'no')):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        fs = FakeFileSystem(dirs={'/src': []})
+        fs.client.archive = archive.getvalue()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = os.path.join(tmp, 'out')
+            proc = self.create_process("download", ["-r", "/src", dest])
+            proc.filesystem = fs
+            proc.cwd = '/'
+            self.assertEqual(cmd(proc), 0)
+            with open(os.path.join(dest, 'sub', 'a.txt'), 'rb') as f:
+                self.assertEqual(f.read(), b'hello')
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'evil.txt')))
+
+    def test_bulk_download_to_root(self):
+        import tarfile
+        cmd = BUILTINS['download']
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar:
+            info = tarfile.TarInfo('sub/a.txt')
+            info.size = 5
+            tar.addfile(info, io.BytesIO(b'hello'))
+        fs = FakeFileSystem(dirs={'/src': []})
+        fs.client.archive = archive.getvalue()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Downloading into '/': the destination resolves to '/', and the
+            # paths under it are redirected into tmp
+            dest = os.path.join(tmp, 'root')
+
+            def fake_realpath(path):
+                if path == dest:
+                    return '/'
+                return os.path.join(tmp, os.path.normpath(path).lstrip('/'))
+
+            proc = self.create_process("download", ["-r", "/src", dest])
+            proc.filesystem = fs
+            proc.cwd = '/'
+            with mock.patch('os.path.realpath', fake_realpath):
+                self.assertEqual(cmd(proc), 0)
+            with open(os.path.join(tmp, 'sub', 'a.txt'), 'rb') as f:
+                self.assertEqual(f.read(), b'hello')
+            self.assertIn(b"Downloaded 1 files", proc.get_stdout())
+
     def test_sort(self):
         cmd = BUILTINS['sort']
         input_data = "c\na\nb\n"
@@ -0,0 +1,109 @@
+import os
+import unittest
+from pyagfs import AGFSClientError
+from agfs_shell.completer import LS_CACHE_SIZE, LS_CACHE_TTL, MUTATING_COMMANDS, ShellCompleter
+
+
+class FakeFileSystem:
+    def __init__(self, tree):
+        self.tree = tree
+        self.calls = []
+
+    def list_directory(self, path):
+        self.calls.append(path)
+        if path not in self.tree:
+            raise AGFSClientError("No such file or directory")
+        return self.tree[path]
+
+
+class TestShellCompleter(unittest.TestCase):
+    def setUp(self):
+        self.fs = FakeFileSystem({
+            '/': [{'name': 'data', 'type': 'directory'}, {'name': 'readme.txt', 'type': 'file'}],
+            '/data': [{'name': 'a.txt', 'type': 'file'}],
+        })
+        self.completer = ShellCompleter(self.fs)
+
+    def test_complete_command(self):
+        self.assertEqual(self.completer._complete_command('mk'), ['mkdir'])
+        self.assertEqual(self.completer._complete_command('zzz'), [])
+        self.assertIn('cat', self.completer._complete_command('c'))
+        # Command names are matched case-sensitively, as typed
+        self.assertEqual(self.completer._complete_command('MK'), [])
+
+    def test_complete_path(self):
+        self.assertEqual(self.completer._complete_path('/d'), ['/data/'])
+        self.assertEqual(self.completer._complete_path('/data/'), ['/data/a.txt'])
+        self.assertEqual(self.completer._complete_path('/data/a'), ['/data/a.txt'])
+
+    def test_complete_relative_path(self):
+        self.completer.shell = type('FakeShell', (), {'cwd': '/data'})()
+        self.assertEqual(self.completer._complete_path('a'), ['a.txt'])
+        self.assertEqual(self.completer._complete_path(''), ['a.txt'])
+
+    def test_large_directory_completes_common_prefix(self):
+        self.fs.tree['/big'] = [{'name': f'f{i:03}', 'type': 'file'} for i in range(200)]
+        matches = self.completer._complete_path('/big/f')
+        self.assertEqual(len(matches), 200)
+        # readline inserts the longest common prefix of the matches
+        self.assertEqual(os.path.commonprefix(matches), '/big/f')
+        self.assertEqual(os.path.commonprefix(self.completer._complete_path('/big/f1')), '/big/f1')
+
+    def test_listing_is_cached(self):
+        self.completer._complete_path('/r')
+        self.completer._complete_path('/re')
+        self.assertEqual(self.fs.calls, ['/'])
+
+    def test_invalidate(self):
+        self.completer._complete_path('/data/')
+        self.completer.invalidate('/data/a.txt')
+        self.completer._complete_path('/data/')
+        self.assertEqual(self.fs.calls, ['/data', '/data'])
+
+    def test_failed_listing_is_not_retried(self):
+        self.assertEqual(self.completer._complete_path('/missing/a'), [])
+        self.assertEqual(self.completer._complete_path('/missing/ab'), [])
+        self.assertEqual(self.fs.calls, ['/missing'])
+
+    def test_invalidate_after_mutating_command(self):
+        self.completer._complete_path('/data/')
+        self.completer.invalidate_after('ls /data')
+        self.completer._complete_path('/data/')
+        self.assertEqual(self.fs.calls, ['/data'])
+        self.completer.invalidate_after('touch /data/b.txt')
+        self.completer._complete_path('/data/')
+        self.assertEqual(self.fs.calls, ['/data', '/data'])
+
+    def test_mutating_builtins_invalidate(self):
+        self.assertEqual(
+            MUTATING_COMMANDS,
+            {'mkdir', 'touch', 'rm', 'mv', 'cp', 'upload', 'mount', 'plugins'},
+        )
+        self.completer._complete_path('/data/')
+        self.completer.invalidate_after('plugins unload /mnt/plugins/p.so')
+        self.completer._complete_path('/data/')
+        self.assertEqual(self.fs.calls, ['/data', '/data'])
+
+    def test_single_directory_match_is_prefetched(self):
+        self.completer._complete_path('/d')
+        self.assertEqual(self.completer._complete_path('/data/'), ['/data/a.txt'])
+        self.assertEqual(self.fs.calls, ['/', '/data'])
+
+    def test_stale_prefetch_is_not_used(self):
+        self.completer.prefetch('/data')
+        started, future = self.completer._inflight['/data']
+        future.result()
+        self.completer._inflight['/data'] = (started - LS_CACHE_TTL, future)
+        self.completer._complete_path('/data/')
+        self.assertEqual(self.fs.calls, ['/data', '/data'])
+        self.assertEqual(self.completer._inflight, {})
+
+    def test_cache_is_bounded(self):
+        for i in range(LS_CACHE_SIZE + 1):
+            self.completer._store(f'/d{i}', [], 0.0)
+        self.assertEqual(len(self.completer._ls_cache), LS_CACHE_SIZE)
+        self.assertNotIn('/d0', self.completer._ls_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
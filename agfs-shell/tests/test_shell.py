@@ -0,0 +1,54 @@
+import io
+import os
+import tempfile
+import unittest
+from agfs_shell.shell import _read_available
+
+
+class TrickleReader(io.RawIOBase):
+    """Raw stream over a file that returns at most 1000 bytes per read,
+    like a pipe returning one pipe-buffer's worth at a time"""
+
+    def __init__(self, f, selectable=True):
+        self.f = f
+        self.selectable = selectable
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        data = self.f.read(min(len(buf), 1000))
+        buf[:len(data)] = data
+        return len(data)
+
+    def fileno(self):
+        if not self.selectable:
+            raise io.UnsupportedOperation("fileno")
+        return self.f.fileno()
+
+
+class TestReadAvailable(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryFile()
+        tmp.write(os.urandom(4500))
+        tmp.seek(0)
+        self.addCleanup(tmp.close)
+        self.tmp = tmp
+
+    def test_fills_chunk_from_waiting_data(self):
+        stream = io.BufferedReader(TrickleReader(self.tmp), buffer_size=512)
+        chunks = []
+        while True:
+            chunk = _read_available(stream, 4000)
+            if not chunk:
+                break
+            chunks.append(len(chunk))
+        self.assertEqual(chunks, [4000, 500])
+
+    def test_unselectable_stream_reads_once(self):
+        stream = io.BufferedReader(TrickleReader(self.tmp, selectable=False), buffer_size=512)
+        self.assertEqual(len(_read_available(stream, 4000)), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()